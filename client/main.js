@@ -62,15 +62,39 @@ const FONT_SIZES = {
 // --- End Constants ---
 
 
-function preload() {
+// Asset manifest written by scripts/generate_*_assets.py (logical name -> content-hashed file)
+const ASSET_MANIFEST_URL = "assets/asset-manifest.json";
+
+function assetUrl(manifest, name) {
+  const entry = manifest && manifest.assets && manifest.assets[name];
+  return "assets/" + (entry ? entry.file : name);
+}
+
+function loadGameAssets(scene, manifest) {
+  const cardsUrl = assetUrl(manifest, "cards.png");
   // Enable high-quality texture loading with filtering
-  this.load.image("cards_img", "assets/cards.png");
+  scene.load.image("cards_img", cardsUrl);
   
-  this.load.spritesheet("cards", "assets/cards.png", {
+  scene.load.spritesheet("cards", cardsUrl, {
     frameWidth: 70,
     frameHeight: 95,
   });
-  this.load.image("card_back", "assets/card_back.png");
+  scene.load.image("card_back", assetUrl(manifest, "card_back.png"));
+}
+
+function preload() {
+  // Load the manifest first; fall back to the fixed file names if it is missing
+  let gameAssetsQueued = false;
+  const queueGameAssets = (manifest) => {
+    if (gameAssetsQueued) return;
+    gameAssetsQueued = true;
+    loadGameAssets(this, manifest);
+  };
+  this.load.json("asset_manifest", ASSET_MANIFEST_URL);
+  this.load.once('filecomplete-json-asset_manifest', (key, type, data) => queueGameAssets(data));
+  this.load.on('loaderror', (file) => {
+    if (file.key === "asset_manifest") queueGameAssets(null);
+  });
   // Socket.IO is already loaded in HTML
   
   // Set texture filtering for high-quality rendering
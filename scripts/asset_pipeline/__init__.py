@@ -0,0 +1,5 @@
+"""
+掼蛋素材生成管线的公共模块
+供 generate_assets.py、generate_premium_assets.py 与 generate_themes.py 共用；
+卡牌生成器（classic、premium）、主题表（themes）和进程内渲染接口（renderer）也在包内
+"""
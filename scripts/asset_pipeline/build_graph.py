@@ -0,0 +1,191 @@
+"""
+构建图调度
+
+素材生成建模成有向无环图：每个任务有名字、依赖和输入键，依赖就绪的任务在线程池中并发执行，
+例如卡背和按钮与牌面无关，可以和牌面渲染同时进行。
+
+- 任务函数按依赖声明的顺序接收依赖任务的结果
+- 带输入键（key）的任务按"任务名 + key + 依赖的输入哈希"缓存结果，同一进程再次构建时直接复用；
+  写文件等有副作用的任务不给 key，每次都执行
+- 标记 persist 的任务（牌面、缩放、排版、精灵表等耗时的纯计算）另外按输入哈希存到磁盘缓存目录，
+  下一次运行脚本时直接读取；输入哈希包含 asset_pipeline 源码的指纹，修改绘制代码后旧结果自动失效
+- 任务名可以带 "<范围>/" 前缀（如多主题构建中的 premium@2x/faces），多套素材的任务放进同一张图、
+  共用一个线程池；输入哈希只用前缀之后的任务名，不同范围里输入相同的任务（如同类主题的按钮）共用结果
+- 构建结束后按实际耗时求关键路径（最耗时的依赖链），它决定了整体耗时的下限
+"""
+
+import hashlib
+import os
+import pickle
+import shutil
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .cache import SharedCache
+from .output import atomic_write
+
+# 任务结果缓存：输入哈希 -> 结果
+NODE_CACHE = SharedCache('build-nodes')
+
+_MISSING = object()
+
+
+def scoped_name(scope, name):
+    """范围内的任务名；scope 为 None 时原样返回"""
+    return f"{scope}/{name}" if scope else name
+
+
+def source_fingerprint():
+    """asset_pipeline 全部源码的哈希：生成器、绘制和编码逻辑都在包内，任何修改都会换一个指纹"""
+    digest = hashlib.sha256()
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    for name in sorted(os.listdir(package_dir)):
+        if name.endswith('.py'):
+            with open(os.path.join(package_dir, name), 'rb') as f:
+                digest.update(name.encode('utf-8') + b'\0' + f.read() + b'\0')
+    return digest.hexdigest()
+
+
+class DiskCache:
+    """按输入哈希把任务结果 pickle 到 <目录>/<源码指纹>/ 下
+
+    只读写本机构建自己生成的文件（pickle 不能用于不可信的数据）。
+    打开时删除其他源码指纹的子目录，缓存只保留当前代码版本的结果；整个目录可以随时删除。
+    """
+
+    def __init__(self, directory):
+        self.fingerprint = source_fingerprint()
+        self.directory = os.path.join(directory, self.fingerprint[:16])
+        os.makedirs(self.directory, exist_ok=True)
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            if name != self.fingerprint[:16] and os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+
+    def _path(self, input_hash):
+        return os.path.join(self.directory, input_hash + '.pickle')
+
+    def load(self, input_hash):
+        """读取缓存结果，不存在或无法读取时返回 _MISSING"""
+        try:
+            with open(self._path(input_hash), 'rb') as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return _MISSING
+
+    def store(self, input_hash, value):
+        atomic_write(self._path(input_hash), pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+class BuildGraph:
+    """按依赖调度的构建任务图"""
+
+    def __init__(self, cache_dir=None):
+        self.tasks = {}
+        self.disk_cache = DiskCache(cache_dir) if cache_dir else None
+        self.timings = {}
+        self.cached = set()
+        self.wall_seconds = 0.0
+
+    def add(self, name, func, deps=(), key=None, persist=False):
+        """添加任务；依赖必须已经添加（因此添加顺序就是拓扑顺序，不会出现环）
+
+        persist=True 的任务在图带有磁盘缓存目录时把结果存到磁盘（需要 key，结果必须可以 pickle）。
+        """
+        if name in self.tasks:
+            raise ValueError(f"重复的任务: {name}")
+        for dep in deps:
+            if dep not in self.tasks:
+                raise ValueError(f"任务 {name} 依赖未定义的任务 {dep}")
+        self.tasks[name] = (func, tuple(deps), key, persist)
+
+    def _input_hash(self, name, hashes):
+        """任务的输入哈希；任务或任一依赖没有 key 时不可缓存，返回 None"""
+        _, deps, key, _ = self.tasks[name]
+        dep_hashes = [hashes[dep] for dep in deps]
+        if key is None or None in dep_hashes:
+            return None
+        # 有磁盘缓存时输入哈希带上源码指纹，代码修改后不会读到旧结果
+        fingerprint = self.disk_cache.fingerprint if self.disk_cache else None
+        base_name = name.rpartition('/')[2]
+        return hashlib.sha256(repr((base_name, key, dep_hashes, fingerprint)).encode('utf-8')).hexdigest()
+
+    def _execute(self, name, input_hash, args):
+        func, _, _, persist = self.tasks[name]
+        disk_cache = self.disk_cache if persist else None
+        start = time.perf_counter()
+        if input_hash is None:
+            result, hit = func(*args), False
+        else:
+            computed = []
+
+            def compute():
+                if disk_cache is not None:
+                    value = disk_cache.load(input_hash)
+                    if value is not _MISSING:
+                        return value
+                computed.append(True)
+                value = func(*args)
+                if disk_cache is not None:
+                    disk_cache.store(input_hash, value)
+                return value
+
+            result = NODE_CACHE.get(input_hash, compute)
+            hit = not computed
+        return result, time.perf_counter() - start, hit
+
+    def run(self, workers=None):
+        """执行所有任务，返回 {任务名: 结果}；任一任务失败时不再调度新任务并抛出异常"""
+        start = time.perf_counter()
+        results = {}
+        hashes = {}
+        pending = list(self.tasks)
+        running = {}
+        self.timings = {}
+        self.cached = set()
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='build') as pool:
+            while pending or running:
+                for name in [name for name in pending if all(dep in results for dep in self.tasks[name][1])]:
+                    pending.remove(name)
+                    hashes[name] = self._input_hash(name, hashes)
+                    args = [results[dep] for dep in self.tasks[name][1]]
+                    running[pool.submit(self._execute, name, hashes[name], args)] = name
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        results[name], seconds, hit = future.result()
+                    except BaseException:
+                        pending.clear()
+                        raise
+                    self.timings[name] = seconds
+                    if hit:
+                        self.cached.add(name)
+
+        self.wall_seconds = time.perf_counter() - start
+        return results
+
+    def critical_path(self):
+        """按实际耗时的最长依赖链，返回 [(任务名, 耗时)]"""
+        finish = {}
+        previous = {}
+        for name, (_, deps, _, _) in self.tasks.items():
+            before = max(deps, key=lambda dep: finish[dep], default=None)
+            finish[name] = self.timings[name] + (finish[before] if before else 0.0)
+            previous[name] = before
+
+        path = []
+        name = max(finish, key=finish.get, default=None)
+        while name is not None:
+            path.append((name, self.timings[name]))
+            name = previous[name]
+        return path[::-1]
+
+    def format_critical_path(self):
+        path = self.critical_path()
+        total = sum(seconds for _, seconds in path)
+        steps = ' → '.join(f"{name} {seconds:.2f}s" + (" (缓存)" if name in self.cached else "")
+                           for name, seconds in path)
+        return f"{steps} | 关键路径 {total:.2f}s / 总耗时 {self.wall_seconds:.2f}s"
@@ -0,0 +1,72 @@
+"""
+进程内共享缓存
+
+字体、字形遮罩、卡牌模板和牌面在不同主题、不同生成器实例之间共享，
+只要输入（缓存键）相同就只计算一次。带锁，可在线程池中使用。
+"""
+
+import threading
+
+
+class SharedCache:
+    """带命中统计的线程安全缓存"""
+
+    def __init__(self, name):
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self._items = {}
+        # 正在计算的键 -> 计算完成时置位的事件
+        self._computing = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, factory):
+        """取出缓存值，不存在时调用 factory() 生成
+
+        在锁外计算，避免长时间阻塞其他线程；其他线程同时要同一个键时等待这次计算的结果，
+        不会重复计算（factory 抛出异常时由等待的线程之一重新计算）。
+        """
+        while True:
+            with self._lock:
+                if key in self._items:
+                    self.hits += 1
+                    return self._items[key]
+                computing = self._computing.get(key)
+                if computing is None:
+                    computing = self._computing[key] = threading.Event()
+                    break
+            computing.wait()
+
+        try:
+            value = factory()
+            with self._lock:
+                self.misses += 1
+                self._items[key] = value
+        finally:
+            with self._lock:
+                del self._computing[key]
+            computing.set()
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        return {'entries': len(self._items), 'hits': self.hits, 'misses': self.misses}
+
+
+# 全局缓存实例
+FONT_CACHE = SharedCache('fonts')
+GLYPH_CACHE = SharedCache('glyphs')
+TEMPLATE_CACHE = SharedCache('templates')
+FACE_CACHE = SharedCache('faces')
+
+ALL_CACHES = (FONT_CACHE, GLYPH_CACHE, TEMPLATE_CACHE, FACE_CACHE)
+
+
+def cache_stats():
+    """所有共享缓存的统计信息"""
+    return {cache.name: cache.stats() for cache in ALL_CACHES}
@@ -0,0 +1,180 @@
+"""
+牌组素材构建图
+
+经典版和专业版共用同一套素材流程，各生成脚本只提供绘制部分：
+生成器（牌面）、卡背渲染函数和按钮皮肤工厂。
+
+    fonts → templates → faces → downscale → pages → sheet → sheet:encode
+                                          │        └→ sheet:packed
+                                          ├→ hitmask:encode
+    back ─────────────────────────────────┴→ states:encode
+    back → back:encode / back:packed
+    buttons → buttons:encode
+    fonts → layout:encode
+
+生成器需要提供 preload_fonts()、preload_templates()、deck.py 用到的 create_* / compose_* 方法，
+以及 colors、scale、card_width 属性；构造参数为 (colors, scale)。
+"""
+
+import os
+
+import numpy as np
+from PIL import Image
+
+from .build_graph import BuildGraph, scoped_name
+from .card_states import write_card_states
+from .deck import STANDARD_DECK, generator_key, render_deck, unique_frames
+from .glyph_atlas import write_card_layout
+from .hitmask import write_hitmask
+from .nine_slice import stretch, write_button_skins
+from .packed_texture import write_packed_sheet, write_packed_textures
+from .palette import encode_report, palette_seeds, quantize_sheet
+from .sheet import (FRAME_HEIGHT, FRAME_WIDTH, MAX_TEXTURE_SIZE, SHEET_INDEX_NAME, downsample_frames,
+                    encode_sheet_index, paginate_sheet)
+
+# 游戏中单张卡牌的尺寸
+FINAL_SIZE = (FRAME_WIDTH, FRAME_HEIGHT)
+
+# 构建图磁盘缓存的默认目录（scripts/.build-cache，不纳入版本库）
+BUILD_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.build-cache')
+
+
+def downscale_faces(cards, frame_size=FINAL_SIZE):
+    """把牌面缩放到帧尺寸（默认游戏尺寸），返回 (不重复帧数组, 每张牌的帧下标)"""
+    return downsample_frames(cards, frame_size)
+
+
+def layout_sheet(scaled, spec=STANDARD_DECK, cols=None, max_size=MAX_TEXTURE_SIZE):
+    """按牌组规格把帧排成网格，超过最大纹理边长时分页，返回 (各页 RGBA 数组, 帧索引)"""
+    frames, indices = scaled
+    # 标准两副牌为一页 12×9 网格
+    return paginate_sheet(frames, indices, spec.frames(), cols, max_size)
+
+
+def build_sheet(pages, seeds, indexed=True, frame_size=FINAL_SIZE, log=print):
+    """各页转成精灵表图像，返回 ([(图像, 清单元数据, 量化报告)], 帧索引)"""
+    arrays, index = pages
+    sheets = []
+    for page, pixels in zip(index['pages'], arrays):
+        spritesheet = Image.fromarray(pixels, 'RGBA')
+        meta = {'frameWidth': frame_size[0], 'frameHeight': frame_size[1]}
+        report = None
+
+        if indexed:
+            # 以主题配色为种子量化成 256 色索引 PNG（带 tRNS），并附逐帧量化误差；每页各用一个调色板
+            names = [entry[0] for entry in index['frames'][page['first']:page['first'] + page['count']]]
+            spritesheet, report = quantize_sheet(spritesheet, seeds, frame_size, names)
+            meta['colors'] = report['colors']
+            log(f"{page['image']} 量化为 {report['colors']} 色，"
+                f"最大逐帧误差 {report['maxError']}（RMSE {report['maxRmse']}）")
+        sheets.append((spritesheet, meta, report))
+    return sheets, index
+
+
+def write_sheet(sheet, writer, log=print):
+    """把各页精灵表（及量化报告）和帧索引交给后台写出，返回各页的 Future"""
+    sheets, index = sheet
+    futures = []
+    for page, (spritesheet, meta, report) in zip(index['pages'], sheets):
+        if report is not None:
+            writer.submit_bytes(encode_report(report), page['image'].rsplit('.', 1)[0] + ".quantization.json")
+        futures.append(writer.submit(spritesheet, page['image'], **meta))
+    writer.submit_bytes(encode_sheet_index(index), SHEET_INDEX_NAME,
+                        pages=len(sheets), frames=len(index['frames']))
+    log(f"精灵表已加入写出队列（{len(futures)} 页，{len(index['frames'])} 帧）")
+    return futures
+
+
+def fit_back(back, frame_size=FINAL_SIZE):
+    """卡背缩放到帧尺寸（生成器已按该尺寸渲染时原样返回）"""
+    return back if back.size == frame_size else back.resize(frame_size, Image.LANCZOS)
+
+
+def write_card_back(card_back, writer, log=print):
+    future = writer.submit(card_back, "card_back.png")
+    log("卡背已加入写出队列")
+    return future
+
+
+def write_buttons(skins, writer, button_size, log=print):
+    """写出按钮图集，以及由同一皮肤按九宫格拉伸得到的旧版固定尺寸按钮"""
+    texture, _ = write_button_skins(skins, writer)
+    log(f"九宫格按钮皮肤 {texture.size[0]}×{texture.size[1]} 已加入写出队列")
+
+    futures = []
+    for name, states in skins.items():
+        skin, insets = states['normal']
+        futures.append(writer.submit(stretch(skin, insets, button_size), f"{name}_button.png"))
+    log("UI素材已加入写出队列")
+    return futures
+
+
+def write_states(frames, card_back, writer, corner_radius, spec=STANDARD_DECK, log=print):
+    """选中/置灰/翻牌状态帧；corner_radius 为游戏尺寸帧上的圆角半径"""
+    sheet_frames = spec.frames()
+    texture, atlas = write_card_states(frames, unique_frames(sheet_frames), card_back,
+                                       corner_radius, sheet_frames, writer)
+    log(f"{len(atlas['frames'])} 个状态帧 ({texture.size[0]}×{texture.size[1]}) 已加入写出队列")
+
+
+def write_layout(generator, writer, spec=STANDARD_DECK, log=print):
+    """SDF 字形图集和牌面布局表"""
+    # 布局只需要绘制指令，用游戏尺寸的同类生成器排版即可
+    layout_generator = type(generator)(colors=generator.colors, scale=FINAL_SIZE[0] / generator.card_width)
+    # 只描述标准牌面帧；附加帧排在其后，精灵表帧号不受影响
+    atlas, layout = write_card_layout(layout_generator, spec.face_frames(), writer)
+    log(f"字形图集 {atlas.size[0]}×{atlas.size[1]}（{len(layout['glyphs'])} 个字形）已加入写出队列")
+
+
+def card_asset_graph(writer, generator, render_back, create_button_skins, corner_radius, button_size,
+                     indexed=True, spec=STANDARD_DECK, cols=None, max_size=MAX_TEXTURE_SIZE, log=print,
+                     cache_dir=None, frame_size=FINAL_SIZE, graph=None, scope=None):
+    """建立一套牌组素材的构建图（尚未执行），调用方可以再添加自己的任务后 run()
+
+    *:encode 任务只把数据交给 writer 就返回，不等待编码完成；全部写出在 writer 关闭时统一等待，
+    这段时间计入 writer 的主线程等待时间。
+
+    render_back(generator) 返回卡背图像；create_button_skins() 返回 {按钮名: {状态: (图像, insets)}}；
+    corner_radius 为生成器设计坐标下的牌面圆角半径；button_size 为旧版固定尺寸按钮的大小。
+    spec 为牌组规格（副数、级牌标记、自定义卡背）；cols 不指定时自动选网格，精灵表超过 max_size 时分页。
+    指定 cache_dir 时牌面、缩放、排版和精灵表的结果存到磁盘，下次运行输入不变就直接读取。
+    frame_size 为输出帧尺寸（多档位时为 tier_size(档位)），生成器应按这个尺寸渲染。
+    传入 graph 时把任务加到这张图里（任务名带 scope 前缀，cache_dir 由那张图决定），
+    多主题、多档位的素材因此在同一个线程池里调度。
+    """
+    key = generator_key(generator)
+    seeds = palette_seeds({**generator.colors, **spec.colors()})
+    frame_radius = corner_radius * frame_size[0] // generator.card_width
+    graph = graph or BuildGraph(cache_dir)
+
+    def add(name, func, deps=(), **options):
+        graph.add(scoped_name(scope, name), func, [scoped_name(scope, dep) for dep in deps], **options)
+
+    # 牌面链：字体 → 模板 → 牌面 → 缩放 → 排版 → 精灵表 → 编码
+    add('fonts', generator.preload_fonts, key=key)
+    add('templates', lambda fonts: generator.preload_templates(), deps=['fonts'], key=key)
+    add('faces', lambda templates: render_deck(generator, spec), deps=['templates'], key=(key, spec.key()),
+        persist=True)
+    add('downscale', lambda faces: downscale_faces(faces, frame_size), deps=['faces'], key=frame_size, persist=True)
+    add('pages', lambda scaled: layout_sheet(scaled, spec, cols, max_size), deps=['downscale'],
+        key=(spec.key(), cols, max_size), persist=True)
+    add('sheet', lambda pages: build_sheet(pages, seeds, indexed, frame_size, log), deps=['pages'],
+        key=(indexed, tuple(seeds)), persist=True)
+    add('sheet:encode', lambda sheet: write_sheet(sheet, writer, log), deps=['sheet'])
+    add('hitmask:encode', lambda scaled: write_hitmask(*scaled, writer), deps=['downscale'])
+    # 低端机用的 16 位纹理（RGBA4444 / RGBA5551），由 RGBA 帧直接导出，不经过调色板
+    add('sheet:packed', lambda pages: write_packed_sheet(*pages, writer), deps=['pages'])
+
+    # 卡背和按钮与牌面无关，和牌面链同时进行
+    add('back', lambda: fit_back(render_back(generator), frame_size), key=(key, render_back.__qualname__, frame_size))
+    add('back:encode', lambda back: write_card_back(back, writer, log), deps=['back'])
+    add('back:packed', lambda back: write_packed_textures(np.asarray(back), "card_back.png", writer),
+        deps=['back'])
+    add('buttons', create_button_skins, key=create_button_skins.__qualname__)
+    add('buttons:encode', lambda skins: write_buttons(skins, writer, button_size, log), deps=['buttons'])
+
+    # 选中/置灰/翻牌状态帧需要缩放后的牌面和卡背；SDF 字形图集只需要字体
+    add('states:encode', lambda scaled, back: write_states(scaled[0], back, writer, frame_radius, spec, log),
+        deps=['downscale', 'back'])
+    add('layout:encode', lambda fonts: write_layout(generator, writer, spec, log), deps=['fonts'])
+    return graph
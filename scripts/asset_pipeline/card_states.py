@@ -0,0 +1,199 @@
+"""
+预计算的卡牌状态帧：选中、置灰和翻牌动画
+
+客户端原来在每个精灵上用运行时着色（setTint）表示选中和不可出的牌，发牌时用缩放补间翻牌，
+27 张手牌在低端手机上开销明显。这里在生成时直接从缩放好的帧（1x，或多主题生成中的各档位）算出这些状态：
+
+- <帧名>:selected  选中：牌边加高亮描边
+- <帧名>:dimmed    置灰：去饱和并压暗
+- back:flip<k> / <帧名>:flip<k>  翻牌中间帧：按转角水平压缩并错切（仿透视）
+
+所有状态都是对 (N, 高, 宽, 4) 帧数组的整体运算，牌越多也只是数组更大；
+翻牌前半段只有卡背，所有牌共用同一组 back:flip<k>。
+翻牌帧只保留有内容的宽度（trimmed），按 Phaser JSON Hash 图集格式记录在原帧中的位置。
+"""
+
+import json
+import math
+
+import numpy as np
+from PIL import Image
+
+from .raster import ShapeCanvas
+from .sheet import FRAME_WIDTH, pack_shelves
+
+STATES_TEXTURE = "card-states.png"
+STATES_ATLAS = "card-states.json"
+
+# 选中高亮色与客户端原来的 cardSelectTint（0x00ffff）一致
+SELECTED_COLOR = (0, 255, 255)
+# 置灰：先向灰度混合，再整体压暗
+DIM_DESATURATE = 0.6
+DIM_BRIGHTNESS = 0.55
+LUMA = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+# 翻牌从 0° 到 90° 分成的步数；中间帧转角为 90 * k / FLIP_STEPS（k = 1 .. FLIP_STEPS-1）
+FLIP_STEPS = 3
+# 转到 90° 时的竖直错切量（每像素水平距离对应的竖直偏移）
+FLIP_SHEAR = 0.12
+# 压缩到很窄时水平方向最多的子采样数
+_MAX_SUBSAMPLES = 4
+
+# 1x 帧的图集宽度；更高档位按帧宽放大（见 atlas_width），图集高度保持在常见的纹理尺寸上限以内
+ATLAS_WIDTH = 1024
+
+
+def atlas_width(frame_width):
+    """图集宽度：ATLAS_WIDTH 按帧宽相对 1x 的倍数放大后取 2 的幂（2x 为 2048，3x 为 4096）"""
+    return 1 << math.ceil(math.log2(ATLAS_WIDTH * frame_width / FRAME_WIDTH))
+
+
+def _premultiply(frames):
+    pixels = frames.astype(np.float32) * (1.0 / 255.0)
+    pixels[..., :3] *= pixels[..., 3:4]
+    return pixels
+
+
+def _unpremultiply(pixels):
+    alpha = np.clip(pixels[..., 3:4], 0.0, 1.0)
+    rgb = np.clip(pixels[..., :3], 0.0, alpha)
+    rgb = np.divide(rgb, alpha, out=np.zeros_like(rgb), where=alpha > 0)
+    return np.rint(np.concatenate([rgb, alpha], axis=-1) * 255.0).astype(np.uint8)
+
+
+def selected_frames(frames, corner_radius):
+    """所有帧叠加同一个高亮描边层"""
+    _, height, width, _ = frames.shape
+    overlay = ShapeCanvas(width, height)
+    overlay.rounded_rectangle([0, 0, width - 1, height - 1], radius=corner_radius,
+                              outline=SELECTED_COLOR + (255,), width=2)
+    # 内侧柔和的第二圈
+    overlay.rounded_rectangle([2, 2, width - 3, height - 3], radius=max(0, corner_radius - 2),
+                              outline=SELECTED_COLOR + (96,), width=3)
+
+    src = overlay.pixels[None]
+    return _unpremultiply(src + _premultiply(frames) * (1.0 - src[..., 3:4]))
+
+
+def dimmed_frames(frames):
+    """去饱和并压暗，alpha 不变"""
+    rgb = frames[..., :3].astype(np.float32)
+    grey = (rgb @ LUMA)[..., None]
+    rgb = (rgb * (1.0 - DIM_DESATURATE) + grey * DIM_DESATURATE) * DIM_BRIGHTNESS
+    out = frames.copy()
+    out[..., :3] = np.rint(rgb)
+    return out
+
+
+def flip_angles(steps=FLIP_STEPS):
+    """翻牌中间帧的转角（度），不含 0°（正面/卡背本身）和 90°（侧面不可见）"""
+    return [90 * k / steps for k in range(1, steps)]
+
+
+def flip_frames(frames, angle, shear=FLIP_SHEAR):
+    """把一组帧绕竖直轴转过 angle 度的仿射近似：水平压缩 cos(angle)，并竖直错切
+
+    错切后四角不能超出原帧高度，竖直方向同步略微压缩。
+    返回 (N, 高, 新宽, 4) 的 uint8 数组，以及新帧在原帧中的 x 偏移。
+    """
+    count, height, width, _ = frames.shape
+    theta = math.radians(angle)
+    scale_x = math.cos(theta)
+    skew = shear * math.sin(theta)
+    out_width = max(1, math.ceil(width * scale_x))
+    offset = (width - out_width) // 2
+    scale_y = 1.0 - abs(skew) * scale_x * width / height
+
+    # 四周补一圈透明像素，越界采样自然得到透明
+    source = np.pad(_premultiply(frames), ((0, 0), (1, 1), (1, 1), (0, 0)))
+    max_u, max_v = width + 0.999, height + 0.999
+
+    subsamples = min(_MAX_SUBSAMPLES, math.ceil(1.0 / scale_x))
+    ys = (np.arange(height, dtype=np.float32) + 0.5 - height / 2)[:, None]
+    result = np.zeros((count, height, out_width, 4), dtype=np.float32)
+    for k in range(subsamples):
+        # 输出像素（以原帧中心为原点）-> 源坐标：u = x / sx，v = (y - skew·x) / sy
+        xs = (offset + np.arange(out_width, dtype=np.float32) + (k + 0.5) / subsamples - width / 2)[None, :]
+        u = np.clip(xs / scale_x + width / 2 + 0.5, 0, max_u)
+        v = np.clip((ys - skew * xs) / scale_y + height / 2 + 0.5, 0, max_v)
+        u0, v0 = u.astype(np.intp), v.astype(np.intp)
+        fu, fv = (u - u0)[..., None], (v - v0)[..., None]
+        # 双线性插值，对所有帧一次性取样
+        top = source[:, v0, u0] * (1 - fu) + source[:, v0, u0 + 1] * fu
+        bottom = source[:, v0 + 1, u0] * (1 - fu) + source[:, v0 + 1, u0 + 1] * fu
+        result += top * (1 - fv) + bottom * fv
+    return _unpremultiply(result / subsamples), offset
+
+
+def build_state_frames(faces, names, back, corner_radius):
+    """faces: 不重复牌面帧 (N, 高, 宽, 4)，names: 对应帧名，back: 卡背帧 (高, 宽, 4)
+
+    返回 [(帧名, 像素数组, x 偏移)]。
+    """
+    states = []
+    for state, frames in (('selected', selected_frames(faces, corner_radius)),
+                          ('dimmed', dimmed_frames(faces))):
+        states.extend((f"{name}:{state}", frame, 0) for name, frame in zip(names, frames))
+
+    for k, angle in enumerate(flip_angles(), start=1):
+        (back_frame,), offset = flip_frames(back[None], angle)
+        states.append((f"back:flip{k}", back_frame, offset))
+        # 转过 90° 后远离观察者的一侧换到另一边，错切方向相反
+        frames, offset = flip_frames(faces, angle, shear=-FLIP_SHEAR)
+        states.extend((f"{name}:flip{k}", frame, offset) for name, frame in zip(names, frames))
+    return states
+
+
+def pack_state_frames(states, frame_size, sheet_frames):
+    """把状态帧装箱成一张纹理，返回 (纹理, Phaser JSON Hash 图集)"""
+    frame_width, frame_height = frame_size
+    sizes = [(pixels.shape[1], pixels.shape[0]) for _, pixels, _ in states]
+    width = atlas_width(frame_width)
+    positions, used_height = pack_shelves(sizes, width)
+
+    texture = np.zeros((used_height, width, 4), dtype=np.uint8)
+    frames = {}
+    for (name, pixels, offset), (x, y) in zip(states, positions):
+        h, w = pixels.shape[:2]
+        texture[y:y + h, x:x + w] = pixels
+        frames[name] = {
+            'frame': {'x': x, 'y': y, 'w': w, 'h': h},
+            'rotated': False,
+            'trimmed': w != frame_width,
+            'spriteSourceSize': {'x': offset, 'y': 0, 'w': w, 'h': h},
+            'sourceSize': {'w': frame_width, 'h': frame_height},
+        }
+
+    steps = range(1, FLIP_STEPS)
+    atlas = {
+        'frames': frames,
+        'meta': {
+            'image': STATES_TEXTURE,
+            'size': {'w': width, 'h': used_height},
+            'scale': '1',
+            'states': ['selected', 'dimmed'],
+            'flip': {
+                'angles': flip_angles(),
+                # card_back 与 {face} 指卡背纹理和精灵表中的牌面本身
+                'sequence': (['card_back'] + [f"back:flip{k}" for k in steps]
+                             + [f"{{face}}:flip{k}" for k in reversed(steps)] + ['{face}']),
+            },
+            # 精灵表 cards.png 的帧顺序（列表下标即精灵表帧号）
+            'sheetFrames': list(sheet_frames),
+        },
+    }
+    return Image.fromarray(texture, 'RGBA'), atlas
+
+
+def encode_atlas(atlas):
+    return json.dumps(atlas, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def write_card_states(faces, names, back, corner_radius, sheet_frames, writer):
+    """生成状态帧图集并交给后台写出"""
+    frame_size = (faces.shape[2], faces.shape[1])
+    states = build_state_frames(faces, names, np.asarray(back.convert('RGBA')), corner_radius)
+    texture, atlas = pack_state_frames(states, frame_size, sheet_frames)
+    writer.submit(texture, STATES_TEXTURE, frames=len(atlas['frames']))
+    writer.submit_bytes(encode_atlas(atlas), STATES_ATLAS)
+    return texture, atlas
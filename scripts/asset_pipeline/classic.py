@@ -0,0 +1,314 @@
+"""
+经典版卡牌生成器
+
+布局坐标使用 4x 设计尺寸（280×380），scale 决定实际输出分辨率。
+generate_assets.py、多主题生成和进程内渲染都从这里创建生成器。
+"""
+
+from .cache import TEMPLATE_CACHE
+from .fonts import load_font, text_size
+from .nine_slice import BUTTON_STATES, skin_width, state_color
+from .raster import ShapeCanvas, scaled_font
+
+# 颜色配置
+COLORS = {
+    'red': (220, 20, 60),      # 红心/方块
+    'black': (40, 40, 40),     # 黑桃/草花
+    'white': (255, 255, 255),  # 白色
+    'cream': (255, 248, 220),  # 奶白色背景
+    'gold': (255, 215, 0),     # 金色边框
+    'blue': (25, 25, 112),     # 深蓝色背景
+    'green': (0, 100, 0),      # 绿色背景
+}
+
+# 花色符号
+SUITS = {
+    'spades': '♠',    # 黑桃
+    'hearts': '♥',    # 红心
+    'diamonds': '♦',  # 方块
+    'clubs': '♣'      # 梅花
+}
+
+# 牌面值
+RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
+
+# 卡牌尺寸 - 4x原始尺寸用于超高清渲染
+CARD_WIDTH = 280  # 4x原始尺寸用于超高清渲染
+CARD_HEIGHT = 380
+CORNER_RADIUS = 40  # 4x缩放
+
+# 字体候选路径（按顺序尝试）
+FONT_PATHS = (
+    "Arial.ttf",
+    "/System/Library/Fonts/Arial.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+)
+
+# 牌面和卡背用到的字号（设计尺寸），构建时预先加载
+FONT_SIZES = (32, 40, 48, 64, 100, 120)
+
+class CardGenerator:
+    def __init__(self, colors=None, scale=1.0):
+        # 布局坐标始终使用 4x 设计尺寸，scale 决定实际输出分辨率
+        # （scale=1 输出 280×380 母版，scale=0.25 直接输出 70×95）
+        self.card_width = CARD_WIDTH
+        self.card_height = CARD_HEIGHT
+        self.scale = scale
+        # 主题配色：在默认配色基础上覆盖
+        self.colors = dict(COLORS)
+        self.colors.update(colors or {})
+    
+    def new_canvas(self, width=None, height=None):
+        """按当前 scale 创建抗锯齿画布"""
+        return ShapeCanvas(width or self.card_width, height or self.card_height, self.scale)
+        
+    def create_card_background(self, is_joker=False):
+        """创建卡牌背景"""
+        if is_joker:
+            key = ('classic', self.scale, 'joker', self.colors['gold'])
+        else:
+            key = ('classic', self.scale, 'card', self.colors['cream'], self.colors['black'])
+        
+        # 背景模板按配色缓存，每张牌在副本上绘制
+        template = TEMPLATE_CACHE.get(key, lambda: self._render_card_background(is_joker))
+        return template.copy()
+    
+    def _render_card_background(self, is_joker):
+        draw = self.new_canvas()
+        
+        # 绘制圆角矩形背景
+        if is_joker:
+            # 王牌特殊背景
+            draw.rounded_rectangle(
+                [2, 2, self.card_width-2, self.card_height-2],
+                radius=CORNER_RADIUS,
+                fill=(50, 50, 50),
+                outline=self.colors['gold'],
+                width=4
+            )
+        else:
+            # 普通卡牌背景
+            draw.rounded_rectangle(
+                [2, 2, self.card_width-2, self.card_height-2],
+                radius=CORNER_RADIUS,
+                fill=self.colors['cream'],
+                outline=self.colors['black'],
+                width=3
+            )
+        
+        return draw
+    
+    def get_font(self, size):
+        """获取字体，使用系统默认字体"""
+        return load_font(FONT_PATHS, size)
+    
+    def preload_fonts(self):
+        """预先加载牌面用到的字体（含按 scale 缩放后的字号）"""
+        return [scaled_font(self.get_font(size), self.scale) for size in FONT_SIZES]
+    
+    def preload_templates(self):
+        """预先渲染普通牌和王牌的背景模板"""
+        self.create_card_background(is_joker=False)
+        self.create_card_background(is_joker=True)
+    
+    def draw_suit_symbol(self, draw, x, y, suit, size=30, color=None):
+        """绘制花色符号"""
+        font = self.get_font(size)
+        symbol = SUITS[suit]
+        color = color or self.colors['black']
+        
+        # 获取文本尺寸
+        text_width, text_height = text_size(font, symbol)
+        
+        # 居中绘制
+        draw.draw_text((x - text_width//2, y - text_height//2), symbol, font, color)
+    
+    def draw_rank_text(self, draw, x, y, rank, size=24, color=None):
+        """绘制牌面值"""
+        font = self.get_font(size)
+        color = color or self.colors['black']
+        
+        # 获取文本尺寸
+        text_width, text_height = text_size(font, rank)
+        
+        # 居中绘制
+        draw.draw_text((x - text_width//2, y - text_height//2), rank, font, color)
+    
+    def create_number_card(self, rank, suit):
+        """创建数字/字母牌"""
+        return self.compose_number_card(rank, suit).to_image()
+    
+    def compose_number_card(self, rank, suit):
+        """绘制数字/字母牌，返回画布（含绘制指令）"""
+        draw = self.create_card_background()
+        
+        # 确定颜色
+        color = self.colors['red'] if suit in ['hearts', 'diamonds'] else self.colors['black']
+        
+        # 绘制左上角 (4x缩放)
+        self.draw_rank_text(draw, 40, 50, rank, 40, color)
+        self.draw_suit_symbol(draw, 40, 90, suit, 32, color)
+        
+        # 绘制右下角（旋转180度）(4x缩放)
+        corner = self.new_canvas(80, 80)
+        self.draw_rank_text(corner, 40, 30, rank, 40, color)
+        self.draw_suit_symbol(corner, 40, 50, suit, 32, color)
+        draw.composite(corner.rotated_180(), (self.card_width-80, self.card_height-80))
+        
+        # 绘制中心图案
+        self.draw_center_pattern(draw, rank, suit, color)
+        
+        return draw
+    
+    def draw_center_pattern(self, draw, rank, suit, color):
+        """绘制中心图案"""
+        center_x = self.card_width // 2
+        center_y = self.card_height // 2
+        
+        if rank in ['J', 'Q', 'K']:
+            # 人头牌：绘制大花色符号 (4x缩放)
+            self.draw_suit_symbol(draw, center_x, center_y, suit, 100, color)
+            self.draw_rank_text(draw, center_x, center_y + 60, rank, 64, color)
+        elif rank == 'A':
+            # A：绘制大花色符号 (4x缩放)
+            self.draw_suit_symbol(draw, center_x, center_y, suit, 120, color)
+        else:
+            # 数字牌：根据数字绘制对应数量的花色符号
+            num = int(rank)
+            self.draw_number_pattern(draw, num, suit, color)
+    
+    def draw_number_pattern(self, draw, num, suit, color):
+        """绘制数字牌的花色图案"""
+        center_x = self.card_width // 2
+        center_y = self.card_height // 2
+        symbol_size = 40  # 4x缩放
+        
+        # 定义不同数字的图案位置
+        patterns = {
+            2: [(center_x, center_y-60), (center_x, center_y+60)],
+            3: [(center_x, center_y-60), (center_x, center_y), (center_x, center_y+60)],
+            4: [(center_x-40, center_y-60), (center_x+40, center_y-60), 
+                (center_x-40, center_y+60), (center_x+40, center_y+60)],
+            5: [(center_x-40, center_y-60), (center_x+40, center_y-60), (center_x, center_y),
+                (center_x-40, center_y+60), (center_x+40, center_y+60)],
+            6: [(center_x-40, center_y-60), (center_x+40, center_y-60), 
+                (center_x-40, center_y), (center_x+40, center_y),
+                (center_x-40, center_y+60), (center_x+40, center_y+60)],
+            7: [(center_x-40, center_y-60), (center_x+40, center_y-60), 
+                (center_x, center_y-30), (center_x-40, center_y), (center_x+40, center_y),
+                (center_x-40, center_y+60), (center_x+40, center_y+60)],
+            8: [(center_x-40, center_y-60), (center_x+40, center_y-60), 
+                (center_x-40, center_y-20), (center_x+40, center_y-20),
+                (center_x-40, center_y+20), (center_x+40, center_y+20),
+                (center_x-40, center_y+60), (center_x+40, center_y+60)],
+            9: [(center_x-40, center_y-60), (center_x+40, center_y-60), 
+                (center_x-40, center_y-30), (center_x+40, center_y-30),
+                (center_x, center_y), (center_x-40, center_y+30), (center_x+40, center_y+30),
+                (center_x-40, center_y+60), (center_x+40, center_y+60)],
+            10: [(center_x-40, center_y-60), (center_x+40, center_y-60), 
+                 (center_x-40, center_y-30), (center_x+40, center_y-30),
+                 (center_x-40, center_y), (center_x+40, center_y),
+                 (center_x-40, center_y+30), (center_x+40, center_y+30),
+                 (center_x-40, center_y+60), (center_x+40, center_y+60)]
+        }
+        
+        if num in patterns:
+            for x, y in patterns[num]:
+                self.draw_suit_symbol(draw, x, y, suit, symbol_size, color)
+    
+    def create_joker_card(self, is_red=False):
+        """创建王牌"""
+        return self.compose_joker_card(is_red).to_image()
+    
+    def compose_joker_card(self, is_red=False):
+        """绘制王牌，返回画布（含绘制指令）"""
+        draw = self.create_card_background(is_joker=True)
+        
+        center_x = self.card_width // 2
+        center_y = self.card_height // 2
+        
+        if is_red:
+            # 大王
+            color = self.colors['red']
+            text = "大王"
+            symbol = "★"
+        else:
+            # 小王
+            color = self.colors['black']
+            text = "小王"
+            symbol = "☆"
+        
+        # 绘制星星符号 (4x缩放)
+        font = self.get_font(120)
+        text_width, text_height = text_size(font, symbol)
+        draw.draw_text((center_x - text_width//2, center_y - text_height//2 - 40), 
+                       symbol, font, color)
+        
+        # 绘制文字 (4x缩放)
+        font = self.get_font(48)
+        text_width, text_height = text_size(font, text)
+        draw.draw_text((center_x - text_width//2, center_y - text_height//2 + 60), 
+                       text, font, color)
+        
+        return draw
+    
+    def create_card_back(self):
+        """创建卡背"""
+        draw = self.new_canvas()
+        
+        # 绘制圆角矩形背景
+        draw.rounded_rectangle(
+            [2, 2, self.card_width-2, self.card_height-2],
+            radius=CORNER_RADIUS,
+            fill=self.colors['blue'],
+            outline=self.colors['gold'],
+            width=4
+        )
+        
+        # 绘制装饰图案 (4x缩放)
+        center_x = self.card_width // 2
+        center_y = self.card_height // 2
+        
+        # 绘制钻石图案 (4x缩放)
+        for i in range(5):
+            for j in range(7):
+                x = 40 + i * 40
+                y = 40 + j * 40
+                if (i + j) % 2 == 0:
+                    draw.ellipse([x-10, y-10, x+10, y+10], fill=self.colors['gold'])
+        
+        # 中心logo (4x缩放)
+        font = self.get_font(40)
+        text = "掼蛋"
+        text_width, text_height = text_size(font, text)
+        draw.draw_text((center_x - text_width//2, center_y - text_height//2), 
+                       text, font, self.colors['gold'])
+        
+        return draw.to_image()
+
+def create_button_skins():
+    """绘制按钮九宫格皮肤：{按钮名: {状态: (图像, insets)}}"""
+    corner_radius = 10
+    
+    # 九宫格皮肤：四角为圆角半径，中间可拉伸
+    inset = corner_radius
+    skin_size = skin_width(inset, inset)
+    
+    def create_button_skin(color, state):
+        """绘制九宫格按钮皮肤，返回 (图像, insets)"""
+        draw = ShapeCanvas(skin_size, skin_size)
+        draw.rounded_rectangle([0, 0, skin_size - 1, skin_size - 1],
+                               radius=corner_radius, fill=state_color(color, state),
+                               outline=state_color(COLORS['white'], state), width=2)
+        return draw.to_image(), (inset, inset, inset, inset)
+    
+    # 出牌、过牌、进贡按钮，每个按钮各有 常态/悬停/按下/禁用 四种状态
+    button_colors = {
+        'play': (0, 150, 0),
+        'pass': (150, 0, 0),
+        'tribute': (0, 0, 150),
+    }
+    return {
+        name: {state: create_button_skin(color, state) for state in BUTTON_STATES}
+        for name, color in button_colors.items()
+    }
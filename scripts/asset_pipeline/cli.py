@@ -0,0 +1,16 @@
+"""
+命令行参数的公共类型
+"""
+
+import argparse
+
+
+def positive_int(value):
+    """argparse 类型：正整数（副数、列数、纹理边长等），否则给出用法错误而不是构建到一半报错"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"不是整数: {value}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"必须是正整数: {value}")
+    return number
@@ -0,0 +1,197 @@
+"""
+牌组帧序列
+
+精灵表中的每一帧用帧名表示：普通牌为 "<花色>_<点数>"（如 spades_10），
+王牌为 joker_small / joker_big。两副牌的牌面完全相同，
+render_frames 对重复帧只渲染一次。
+
+比赛和变体规则用 DeckSpec 描述任意副数的牌组，另外可以带两类附加帧（排在标准帧之后，
+标准帧的下标不变）：级牌标记帧 "<花色>_<点数>:level"（牌面右上角加一个标记角）
+和自定义卡背帧 "back:<卡背名>"（按配色覆盖重新绘制的卡背）。
+
+牌面按绘制指令去重：画布记录的指令相同、scale 相同的牌面（如只改卡背配色的主题与原主题）
+在进程内只栅格化一次，不需要手工列出每张牌面用到了哪些配色。
+"""
+
+from PIL import Image
+
+from .cache import FACE_CACHE
+from .raster import ShapeCanvas
+from .sheet import FRAME_WIDTH
+
+SUIT_ORDER = ['spades', 'hearts', 'diamonds', 'clubs']
+RANK_ORDER = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
+
+JOKER_SMALL = 'joker_small'
+JOKER_BIG = 'joker_big'
+
+LEVEL_SUFFIX = ':level'
+BACK_PREFIX = 'back:'
+
+# 级牌标记角：边长和离牌边的距离（相对牌宽），避开圆角
+LEVEL_MARKER_SIZE = 0.2
+LEVEL_MARKER_INSET = 0.08
+LEVEL_MARKER_COLOR = (255, 215, 0)
+
+
+def frame_name(suit, rank):
+    return f"{suit}_{rank}"
+
+
+def standard_deck_frames(decks=2):
+    """掼蛋标准帧顺序：每副牌 黑桃/红心/方块/梅花 各 2-A，之后每副各一对小王、大王"""
+    frames = []
+    for _ in range(decks):
+        for suit in SUIT_ORDER:
+            for rank in RANK_ORDER:
+                frames.append(frame_name(suit, rank))
+    for _ in range(decks):
+        frames.append(JOKER_SMALL)
+        frames.append(JOKER_BIG)
+    return frames
+
+
+def level_frame(suit, rank):
+    return f"{suit}_{rank}{LEVEL_SUFFIX}"
+
+
+def back_frame(name):
+    return f"{BACK_PREFIX}{name}"
+
+
+class DeckSpec:
+    """牌组规格：副数、需要级牌标记的点数、自定义卡背（卡背名 -> 配色覆盖）"""
+
+    def __init__(self, decks=2, level_ranks=(), backs=None, marker_color=LEVEL_MARKER_COLOR):
+        if decks < 1:
+            raise ValueError("decks 必须至少为 1")
+        unknown = [rank for rank in level_ranks if rank not in RANK_ORDER]
+        if unknown:
+            raise ValueError(f"未知的级牌点数: {', '.join(unknown)}")
+        self.decks = decks
+        self.level_ranks = tuple(level_ranks)
+        self.backs = dict(backs or {})
+        self.marker_color = tuple(marker_color)
+
+    def face_frames(self):
+        """标准牌面帧（不含附加帧），牌面布局表等只描述这一部分"""
+        return standard_deck_frames(self.decks)
+
+    def frames(self):
+        """精灵表帧顺序：标准帧，之后每个级牌点数按花色各一帧标记帧，最后是自定义卡背"""
+        frames = self.face_frames()
+        for rank in self.level_ranks:
+            frames.extend(level_frame(suit, rank) for suit in SUIT_ORDER)
+        frames.extend(back_frame(name) for name in self.backs)
+        return frames
+
+    def colors(self):
+        """附加帧用到的颜色（量化精灵表时作为调色板种子）"""
+        colors = {}
+        if self.level_ranks:
+            colors['level_marker'] = self.marker_color
+        for name, overrides in self.backs.items():
+            colors.update((f"{name}:{key}", color) for key, color in overrides.items())
+        return colors
+
+    def key(self):
+        """决定帧内容的参数（用作构建缓存的输入键）"""
+        backs = tuple((name, tuple(sorted(colors.items()))) for name, colors in self.backs.items())
+        return (self.decks, self.level_ranks, backs, self.marker_color)
+
+
+# 掼蛋标准牌组：两副牌 108 帧
+STANDARD_DECK = DeckSpec()
+
+
+def unique_frames(frames):
+    """去重并保持首次出现的顺序"""
+    return list(dict.fromkeys(frames))
+
+
+def render_face(generator, name):
+    """用生成器渲染单个帧名对应的牌面"""
+    if name == JOKER_SMALL:
+        return generator.create_joker_card(is_red=False)
+    if name == JOKER_BIG:
+        return generator.create_joker_card(is_red=True)
+    suit, rank = name.split('_', 1)
+    return generator.create_number_card(rank, suit)
+
+
+def compose_face(generator, name):
+    """与 render_face 相同，但返回画布（带设计坐标下的绘制指令），供生成牌面布局使用"""
+    if name == JOKER_SMALL:
+        return generator.compose_joker_card(is_red=False)
+    if name == JOKER_BIG:
+        return generator.compose_joker_card(is_red=True)
+    suit, rank = name.split('_', 1)
+    return generator.compose_number_card(rank, suit)
+
+
+def mark_level(image, color=LEVEL_MARKER_COLOR):
+    """在牌面右上角画级牌标记角，返回新图像"""
+    width, height = image.size
+    size = width * LEVEL_MARKER_SIZE
+    right, top = width * (1 - LEVEL_MARKER_INSET), width * LEVEL_MARKER_INSET
+    canvas = ShapeCanvas(width, height)
+    canvas.polygon([(right - size, top), (right, top), (right, top + size)], fill=color)
+    return Image.alpha_composite(image.convert('RGBA'), canvas.to_image())
+
+
+def render_back(generator, colors):
+    """用配色覆盖后的同类生成器绘制自定义卡背（与牌面同一分辨率）"""
+    variant = type(generator)(colors={**generator.colors, **colors}, scale=generator.scale)
+    return variant.create_card_back()
+
+
+def generator_key(generator):
+    """决定渲染结果的生成器参数：类型、scale 和配色（用作构建缓存的输入键）"""
+    return (type(generator).__name__, generator.scale, tuple(sorted(generator.colors.items())))
+
+
+def record_face(generator, name):
+    """绘制牌面并返回画布，用来取绘制指令
+
+    指令使用设计坐标，与分辨率无关，因此在游戏尺寸（最小的档位）的同类生成器上绘制；
+    生成器本身就是游戏尺寸时，返回的画布同时就是渲染结果。
+    """
+    scale = FRAME_WIDTH / generator.card_width
+    if generator.scale != scale:
+        generator = type(generator)(colors=generator.colors, scale=scale)
+    return compose_face(generator, name)
+
+
+def render_shared_face(generator, name):
+    """渲染牌面，按 (scale, 绘制指令摘要) 在进程内共享：其他主题画出过相同指令的牌面时直接复用"""
+    canvas = record_face(generator, name)
+    if canvas.scale == generator.scale:
+        render = canvas.to_image
+    else:
+        render = lambda: render_face(generator, name)
+    return FACE_CACHE.get((generator.scale, canvas.ops_digest()), render)
+
+
+def render_frames(generator, frames, spec=STANDARD_DECK):
+    """渲染帧序列，重复的帧共用同一张图像（牌面经 render_shared_face 在主题之间共享）
+
+    级牌标记帧在对应牌面上加标记（牌面只渲染一次），卡背帧按 spec.backs 中的配色绘制。
+    """
+    faces = {}
+
+    def face(name):
+        if name not in faces:
+            if name.endswith(LEVEL_SUFFIX):
+                faces[name] = mark_level(face(name[:-len(LEVEL_SUFFIX)]), spec.marker_color)
+            elif name.startswith(BACK_PREFIX):
+                faces[name] = render_back(generator, spec.backs[name[len(BACK_PREFIX):]])
+            else:
+                faces[name] = render_shared_face(generator, name)
+        return faces[name]
+
+    return [face(name) for name in frames]
+
+
+def render_deck(generator, spec=STANDARD_DECK):
+    """按牌组规格渲染全部帧"""
+    return render_frames(generator, spec.frames(), spec)
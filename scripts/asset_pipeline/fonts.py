@@ -0,0 +1,59 @@
+"""
+字体与字形缓存
+
+load_font 按候选路径和字号缓存字体对象；glyph 缓存文字的灰度遮罩，
+遮罩与颜色无关，所以不同配色的主题可以共用同一份字形。
+"""
+
+from PIL import Image, ImageDraw, ImageFont
+
+from .cache import FONT_CACHE, GLYPH_CACHE
+
+
+def _open_font(candidates, size):
+    for font_path in candidates:
+        try:
+            return ImageFont.truetype(font_path, size)
+        except OSError:
+            continue
+    # 回退到默认字体
+    return ImageFont.load_default()
+
+
+def load_font(candidates, size):
+    """按顺序尝试候选字体路径，返回第一个可用的字体（带缓存）"""
+    candidates = tuple(candidates)
+    return FONT_CACHE.get((candidates, size), lambda: _open_font(candidates, size))
+
+
+def _font_key(font):
+    path = getattr(font, 'path', None)
+    if path is None:
+        # 默认位图字体没有路径，按对象区分（load_font 返回的字体常驻缓存）
+        return ('default', id(font))
+    return (path, font.size, font.index)
+
+
+def _render_glyph(font, text):
+    bbox = font.getbbox(text)
+    width = max(1, bbox[2] - bbox[0])
+    height = max(1, bbox[3] - bbox[1])
+    mask = Image.new('L', (width, height), 0)
+    ImageDraw.Draw(mask).text((-bbox[0], -bbox[1]), text, fill=255, font=font)
+    return bbox, mask
+
+
+def glyph(font, text):
+    """返回 (bbox, 遮罩)，bbox 与 draw.textbbox((0, 0), text) 一致"""
+    return GLYPH_CACHE.get((_font_key(font), text), lambda: _render_glyph(font, text))
+
+
+def text_bbox(font, text):
+    """文字边界框，与 draw.textbbox((0, 0), text, font=font) 一致（只测量，不渲染）"""
+    return GLYPH_CACHE.get(('bbox', _font_key(font), text), lambda: font.getbbox(text))
+
+
+def text_size(font, text):
+    """文字宽高（与 textbbox 的计算方式一致）"""
+    bbox = text_bbox(font, text)
+    return bbox[2] - bbox[0], bbox[3] - bbox[1]
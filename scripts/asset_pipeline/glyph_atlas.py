@@ -0,0 +1,215 @@
+"""
+有向距离场（SDF）字形图集与牌面布局表
+
+牌面上除了背景模板和王牌圆环，其余都是文字：花色符号、点数、JACK 等名称、大王/小王。
+这里把每个用到的（字体, 文字）只渲染一次，存成单通道 SDF 图集（glyph-atlas.png），
+再把每张牌描述成"背景模板 + 形状 + 字形摆放"的布局表（card-layout.json）。
+客户端用 SDF 着色器按任意缩放绘制，边缘始终清晰，不需要为每个分辨率档位单独出图。
+
+布局坐标全部使用生成器的设计尺寸（如 420×570），来自 ShapeCanvas 记录的绘制指令，
+因此与位图牌面的排版完全一致。字形摆放 [glyph, x0, y0, x1, y1, color, rotation]
+给出字形墨迹框在牌面上的位置：把图集中该字形的 ink 矩形映射到 (x0, y0, x1, y1) 即可，
+cell 比 ink 四周多出 spread 像素的距离场过渡带。
+"""
+
+import json
+import math
+import os
+
+import numpy as np
+from PIL import Image
+
+from .deck import JOKER_BIG, JOKER_SMALL, compose_face, unique_frames
+from .fonts import glyph
+from .raster import scaled_font
+from .sheet import pack_shelves
+
+ATLAS_NAME = "glyph-atlas.png"
+LAYOUT_NAME = "card-layout.json"
+LAYOUT_VERSION = 1
+
+# 图集中字形的参考字号（像素），以及距离场过渡带宽度（参考字号下的像素）
+GLYPH_SIZE = 32
+SPREAD = 4
+# 先以 SUPERSAMPLE 倍字号渲染二值遮罩，再计算距离，边缘位置精确到 1/SUPERSAMPLE 像素
+SUPERSAMPLE = 4
+
+ATLAS_WIDTH = 256
+# 距离计算按行分块，控制 (行, 列, 源列) 中间数组的内存
+_ROW_CHUNK = 8
+
+GLYPH_FIELDS = ['glyph', 'x0', 'y0', 'x1', 'y1', 'color', 'rotation']
+
+
+def _distance_to(mask, rows, cols):
+    """采样点 (rows × cols 网格) 到 mask 中最近 True 像素中心的精确欧氏距离
+
+    先按列求每个像素到本列最近目标的竖直距离，再对每个采样点取所有列上 dx² + dy² 的最小值。
+    """
+    height, width = mask.shape
+    index = np.arange(height)[:, None]
+    far = height + width
+    above = np.maximum.accumulate(np.where(mask, index, -far), axis=0)
+    below = np.minimum.accumulate(np.where(mask, index, 2 * far)[::-1], axis=0)[::-1]
+    vertical = np.minimum(index - above, below - index)[rows].astype(np.float32)
+
+    dx = (cols[:, None] - np.arange(width)[None, :]).astype(np.float32) ** 2
+    dist2 = np.empty((len(rows), len(cols)), dtype=np.float32)
+    for start in range(0, len(rows), _ROW_CHUNK):
+        dy = vertical[start:start + _ROW_CHUNK] ** 2
+        dist2[start:start + len(dy)] = (dx[None, :, :] + dy[:, None, :]).min(axis=2)
+    return np.sqrt(dist2)
+
+
+def signed_distance_field(mask, supersample=SUPERSAMPLE, spread=SPREAD):
+    """高分辨率二值遮罩 -> 缩小 supersample 倍的 uint8 距离场（128 附近为边缘，内部更亮）"""
+    out_height = mask.shape[0] // supersample
+    out_width = mask.shape[1] // supersample
+    rows = np.arange(out_height) * supersample + supersample // 2
+    cols = np.arange(out_width) * supersample + supersample // 2
+
+    inside = mask[np.ix_(rows, cols)]
+    # 边缘位于相邻像素中心之间，距离各减半个像素
+    to_shape = _distance_to(mask, rows, cols) - 0.5
+    to_background = _distance_to(~mask, rows, cols) - 0.5
+    distance = np.where(inside, -to_background, to_shape) / supersample
+
+    value = np.clip(0.5 - distance / (2 * spread), 0.0, 1.0)
+    return np.rint(value * 255).astype(np.uint8)
+
+
+def rasterize_glyph(font, text):
+    """把一段文字渲染成 SDF 单元格，返回 (L 图像, 单元格内的墨迹矩形)"""
+    big_font = scaled_font(font, GLYPH_SIZE * SUPERSAMPLE / font.size)
+    _, mask = glyph(big_font, text)
+    mask = np.asarray(mask) >= 128
+
+    pad = SPREAD * SUPERSAMPLE
+    out_width = math.ceil(mask.shape[1] / SUPERSAMPLE) + 2 * SPREAD
+    out_height = math.ceil(mask.shape[0] / SUPERSAMPLE) + 2 * SPREAD
+    padded = np.zeros((out_height * SUPERSAMPLE, out_width * SUPERSAMPLE), dtype=bool)
+    padded[pad:pad + mask.shape[0], pad:pad + mask.shape[1]] = mask
+
+    ink = [SPREAD, SPREAD,
+           round(SPREAD + mask.shape[1] / SUPERSAMPLE, 2), round(SPREAD + mask.shape[0] / SUPERSAMPLE, 2)]
+    return Image.fromarray(signed_distance_field(padded), 'L'), ink
+
+
+def _font_name(font):
+    path = getattr(font, 'path', None)
+    if not isinstance(path, str):
+        return 'default'
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def _coords(values):
+    return [round(v, 2) for v in values]
+
+
+class _ColorTable:
+    """布局中的颜色去重成调色表，指令里只存下标"""
+
+    def __init__(self):
+        self.colors = []
+        self._index = {}
+
+    def index(self, color):
+        if color is None:
+            return None
+        rgba = tuple(color) if len(color) == 4 else (*color, 255)
+        if rgba not in self._index:
+            self._index[rgba] = len(self.colors)
+            self.colors.append(list(rgba))
+        return self._index[rgba]
+
+
+def _shape_entry(op, colors):
+    """形状指令 -> 布局条目（坐标取两位小数，颜色换成调色表下标）"""
+    entry = {'op': op['op']}
+    if 'box' in op:
+        entry['box'] = _coords(op['box'])
+    if 'points' in op:
+        entry['points'] = [_coords(point) for point in op['points']]
+    for key in ('radius', 'width'):
+        if key in op:
+            entry[key] = op[key]
+    for key in ('fill', 'outline', 'start', 'end'):
+        if op.get(key) is not None:
+            entry[key] = colors.index(op[key])
+    return entry
+
+
+def build_card_layout(generator, frames):
+    """用生成器排版所有帧，返回 (SDF 图集图像, 布局表 dict)
+
+    排版只需要绘制指令，与生成器的 scale 无关，传入低分辨率生成器可以更快。
+    """
+    colors = _ColorTable()
+    glyph_index = {}
+    glyph_fonts = []
+    bases = {}
+    faces = {}
+
+    for name in unique_frames(frames):
+        canvas = compose_face(generator, name)
+        base = 'joker' if name in (JOKER_SMALL, JOKER_BIG) else 'card'
+        if base not in bases:
+            bases[base] = [_shape_entry(op, colors) for op in canvas.base_ops]
+
+        shapes = []
+        placements = []
+        for op in canvas.ops:
+            if op['op'] != 'text':
+                shapes.append(_shape_entry(op, colors))
+                continue
+            key = (_font_name(op['font']), op['text'])
+            if key not in glyph_index:
+                glyph_index[key] = len(glyph_fonts)
+                glyph_fonts.append((key, op['font']))
+            placements.append([glyph_index[key], *_coords(op['box']),
+                               colors.index(op['color']), op['rotation']])
+        faces[name] = {'base': base, 'shapes': shapes, 'glyphs': placements}
+
+    # 每个字形只渲染一次，装箱进图集
+    cells = [rasterize_glyph(font, text) for (_, text), font in glyph_fonts]
+    positions, used_height = pack_shelves([cell.size for cell, _ in cells], ATLAS_WIDTH)
+    # 高度对齐到 4 像素（纹理行对齐），不强制 2 的幂
+    atlas_height = (used_height + 3) // 4 * 4
+    atlas = Image.new('L', (ATLAS_WIDTH, atlas_height), 0)
+
+    glyphs = []
+    for ((font_name, text), _), (cell, ink), (x, y) in zip(glyph_fonts, cells, positions):
+        atlas.paste(cell, (x, y))
+        glyphs.append({'font': font_name, 'text': text,
+                       'x': x, 'y': y, 'w': cell.size[0], 'h': cell.size[1], 'ink': ink})
+
+    layout = {
+        'version': LAYOUT_VERSION,
+        'atlas': ATLAS_NAME,
+        'atlasWidth': ATLAS_WIDTH,
+        'atlasHeight': atlas_height,
+        'glyphSize': GLYPH_SIZE,
+        'spread': SPREAD,
+        'designWidth': generator.card_width,
+        'designHeight': generator.card_height,
+        'colors': colors.colors,
+        'glyphs': glyphs,
+        'glyphFields': GLYPH_FIELDS,
+        'bases': bases,
+        'faces': faces,
+        'frames': list(frames),
+    }
+    return atlas, layout
+
+
+def encode_layout(layout):
+    """紧凑、可复现的 JSON 编码"""
+    return json.dumps(layout, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def write_card_layout(generator, frames, writer):
+    """生成图集和布局表并交给后台写出"""
+    atlas, layout = build_card_layout(generator, frames)
+    writer.submit(atlas, ATLAS_NAME, glyphs=len(layout['glyphs']), glyphSize=GLYPH_SIZE, spread=SPREAD)
+    writer.submit_bytes(encode_layout(layout), LAYOUT_NAME, frames=len(frames))
+    return atlas, layout
@@ -0,0 +1,128 @@
+"""
+逐帧裁剪边界与 1 位点击遮罩
+
+手牌互相重叠，圆角和透明边距处的点击应该落到下面的牌上。
+这里为精灵表的每一帧计算紧凑的 alpha 边界框和按 cell×cell 像素降采样的 1 位遮罩，
+打包成一个小的二进制附属文件（cards.hitmask.bin），客户端点击检测只需一次位查找。
+
+文件格式（小端）：
+
+    偏移  类型            内容
+    0     4s             魔数 b'HMSK'
+    4     u8             版本（1）
+    5     u8             cell：遮罩一格对应的像素边长
+    6     u16 × 2        帧宽、帧高（像素）
+    10    u16            精灵表帧数 F
+    12    u16            不重复遮罩数 M
+    14    u16 × 3        遮罩宽、高（格）和每行字节数
+    20    u16 × F        帧 -> 遮罩下标
+    ..    u16 × 4 × M    每个遮罩对应帧的裁剪框 (x0, y0, x1, y1)，像素，右下不含
+    ..    u8 × M × 高 × 每行字节数   遮罩位，每行从高位开始
+
+点击 (px, py)（帧内像素坐标）：先用裁剪框快速排除，再查
+bits[m][py // cell][(px // cell) >> 3] >> (7 - ((px // cell) & 7)) & 1。
+"""
+
+import struct
+
+import numpy as np
+
+HITMASK_NAME = "cards.hitmask.bin"
+HITMASK_MAGIC = b'HMSK'
+HITMASK_VERSION = 1
+
+# 默认每 2×2 像素一位
+HITMASK_CELL = 2
+# 裁剪框：alpha 大于该值的像素算作有内容
+TRIM_THRESHOLD = 0
+# 遮罩：格内平均 alpha 不低于该值（即覆盖一半以上）算作可点击
+HIT_THRESHOLD = 128
+
+_HEADER = struct.Struct('<4sBBHHHHHHH')
+
+
+def trim_bounds(frames, threshold=TRIM_THRESHOLD):
+    """每帧的紧凑 alpha 边界框，返回 (N, 4) 的 (x0, y0, x1, y1)，全透明的帧为 (0, 0, 0, 0)"""
+    opaque = frames[..., 3] > threshold
+    rows = opaque.any(axis=2)
+    cols = opaque.any(axis=1)
+    height, width = opaque.shape[1:]
+
+    has_content = rows.any(axis=1)
+    y0 = rows.argmax(axis=1)
+    y1 = height - rows[:, ::-1].argmax(axis=1)
+    x0 = cols.argmax(axis=1)
+    x1 = width - cols[:, ::-1].argmax(axis=1)
+    bounds = np.stack([x0, y0, x1, y1], axis=1)
+    bounds[~has_content] = 0
+    return bounds
+
+
+def hit_masks(frames, cell=HITMASK_CELL, threshold=HIT_THRESHOLD):
+    """按 cell×cell 像素降采样的 1 位遮罩，返回按行打包的 (N, 遮罩高, 每行字节数) uint8"""
+    count, height, width, _ = frames.shape
+    mask_height = -(-height // cell)
+    mask_width = -(-width // cell)
+
+    # 补齐到 cell 的整数倍后按格求平均 alpha；边缘不完整的格只按帧内像素平均
+    alpha = np.zeros((count, mask_height * cell, mask_width * cell), dtype=np.float32)
+    alpha[:, :height, :width] = frames[..., 3]
+    total = alpha.reshape(count, mask_height, cell, mask_width, cell).sum(axis=(2, 4))
+    rows = np.minimum(cell, height - np.arange(mask_height) * cell)
+    cols = np.minimum(cell, width - np.arange(mask_width) * cell)
+    coverage = total / (rows[:, None] * cols[None, :])
+    return np.packbits(coverage >= threshold, axis=2)
+
+
+def encode_hitmask(frames, indices, cell=HITMASK_CELL):
+    """frames: 不重复帧 (M, 高, 宽, 4)，indices: 精灵表每帧对应的不重复帧下标"""
+    count, height, width, _ = frames.shape
+    masks = hit_masks(frames, cell)
+    mask_height, row_bytes = masks.shape[1:]
+    header = _HEADER.pack(HITMASK_MAGIC, HITMASK_VERSION, cell, width, height,
+                          len(indices), count, -(-width // cell), mask_height, row_bytes)
+    return b''.join([
+        header,
+        np.asarray(indices, dtype='<u2').tobytes(),
+        trim_bounds(frames).astype('<u2').tobytes(),
+        masks.tobytes(),
+    ])
+
+
+def decode_hitmask(data):
+    """解析附属文件，返回 dict（frames -> 遮罩下标、trims、masks 等）"""
+    magic, version, cell, width, height, frame_count, mask_count, mask_width, mask_height, row_bytes = \
+        _HEADER.unpack_from(data)
+    if magic != HITMASK_MAGIC or version != HITMASK_VERSION:
+        raise ValueError("不是有效的点击遮罩文件")
+    offset = _HEADER.size
+    indices = np.frombuffer(data, '<u2', frame_count, offset)
+    offset += indices.nbytes
+    trims = np.frombuffer(data, '<u2', mask_count * 4, offset).reshape(mask_count, 4)
+    offset += trims.nbytes
+    masks = np.frombuffer(data, np.uint8, mask_count * mask_height * row_bytes, offset)
+    return {
+        'cell': cell,
+        'frame_size': (width, height),
+        'mask_size': (mask_width, mask_height),
+        'indices': indices,
+        'trims': trims,
+        'masks': masks.reshape(mask_count, mask_height, row_bytes),
+    }
+
+
+def hit_test(hitmask, frame, x, y):
+    """帧内像素坐标 (x, y) 是否点中第 frame 帧（与客户端的查找方式相同）"""
+    mask = hitmask['indices'][frame]
+    x0, y0, x1, y1 = hitmask['trims'][mask]
+    if not (x0 <= x < x1 and y0 <= y < y1):
+        return False
+    cx, cy = x // hitmask['cell'], y // hitmask['cell']
+    return bool(hitmask['masks'][mask, cy, cx >> 3] >> (7 - (cx & 7)) & 1)
+
+
+def write_hitmask(frames, indices, writer, cell=HITMASK_CELL):
+    """生成点击遮罩附属文件并交给后台写出"""
+    data = encode_hitmask(frames, indices, cell)
+    writer.submit_bytes(data, HITMASK_NAME, cell=cell, frames=len(indices))
+    return data
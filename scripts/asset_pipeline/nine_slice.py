@@ -0,0 +1,121 @@
+"""
+九宫格按钮皮肤
+
+按钮只渲染一张很窄的皮肤：四角保持原样，四边和中间可以拉伸，
+客户端按 insets 拉伸到任意尺寸，不再需要每种尺寸一张图。
+悬停、按下、禁用等状态在生成时用调整后的颜色重新绘制（而不是运行时着色），
+所有按钮的所有状态打包进一张纹理，元数据使用 Phaser 的 JSON Hash 图集格式，
+每帧额外带 nineSlice 插入边距（Phaser 3.60+ 可直接用于 add.nineslice）。
+"""
+
+import json
+
+from PIL import Image
+
+BUTTONS_TEXTURE = "ui-buttons.png"
+BUTTONS_ATLAS = "ui-buttons.json"
+
+BUTTON_STATES = ('normal', 'hover', 'pressed', 'disabled')
+
+# 皮肤中间可拉伸区域的宽度（像素）
+SKIN_CENTER = 4
+
+
+def state_color(color, state):
+    """按状态调整颜色：悬停提亮、按下压暗、禁用去饱和并压低对比（保留 alpha）"""
+    r, g, b = color[:3]
+    alpha = color[3:]
+    if state == 'hover':
+        r, g, b = (c + (255 - c) * 0.2 for c in (r, g, b))
+    elif state == 'pressed':
+        r, g, b = (c * 0.8 for c in (r, g, b))
+    elif state == 'disabled':
+        grey = 0.299 * r + 0.587 * g + 0.114 * b
+        r = g = b = grey * 0.5 + 128 * 0.5
+    elif state != 'normal':
+        raise ValueError(f"未知的按钮状态: {state}")
+    return tuple(int(round(c)) for c in (r, g, b)) + tuple(alpha)
+
+
+def skin_width(left, right):
+    return left + SKIN_CENTER + right
+
+
+def stretch(skin, insets, size):
+    """按九宫格规则把皮肤拉伸到 size=(宽, 高)（与客户端的拉伸方式一致）"""
+    left, top, right, bottom = insets
+    src_w, src_h = skin.size
+    width, height = size
+    if width < left + right or height < top + bottom:
+        raise ValueError(f"目标尺寸 {size} 小于九宫格边距 {insets}")
+
+    src_x = (0, left, src_w - right, src_w)
+    src_y = (0, top, src_h - bottom, src_h)
+    dst_x = (0, left, width - right, width)
+    dst_y = (0, top, height - bottom, height)
+
+    result = Image.new('RGBA', size, (0, 0, 0, 0))
+    for row in range(3):
+        for col in range(3):
+            box = (src_x[col], src_y[row], src_x[col + 1], src_y[row + 1])
+            target = (dst_x[col + 1] - dst_x[col], dst_y[row + 1] - dst_y[row])
+            if box[2] <= box[0] or box[3] <= box[1] or target[0] <= 0 or target[1] <= 0:
+                continue
+            piece = skin.crop(box)
+            if piece.size != target:
+                piece = piece.resize(target, Image.BILINEAR)
+            result.paste(piece, (dst_x[col], dst_y[row]))
+    return result
+
+
+def pack_button_skins(skins, gap=1):
+    """skins: {按钮名: {状态: (皮肤图像, insets)}}，按 按钮 × 状态 网格打包
+
+    返回 (纹理, 图集 dict)；帧名为 "<按钮>_<状态>"，如 play_hover。
+    """
+    cells = [(f"{name}_{state}", image, insets)
+             for name, states in skins.items()
+             for state, (image, insets) in states.items()]
+    cols = len(BUTTON_STATES)
+    cell_w = max(image.size[0] for _, image, _ in cells)
+    cell_h = max(image.size[1] for _, image, _ in cells)
+    rows = (len(cells) + cols - 1) // cols
+
+    texture = Image.new('RGBA', (cols * (cell_w + gap) - gap, rows * (cell_h + gap) - gap), (0, 0, 0, 0))
+    frames = {}
+    for i, (frame, image, (left, top, right, bottom)) in enumerate(cells):
+        x, y = (i % cols) * (cell_w + gap), (i // cols) * (cell_h + gap)
+        texture.paste(image, (x, y))
+        w, h = image.size
+        frames[frame] = {
+            'frame': {'x': x, 'y': y, 'w': w, 'h': h},
+            'rotated': False,
+            'trimmed': False,
+            'spriteSourceSize': {'x': 0, 'y': 0, 'w': w, 'h': h},
+            'sourceSize': {'w': w, 'h': h},
+            'nineSlice': {'left': left, 'top': top, 'right': right, 'bottom': bottom},
+        }
+
+    atlas = {
+        'frames': frames,
+        'meta': {
+            'image': BUTTONS_TEXTURE,
+            'size': {'w': texture.size[0], 'h': texture.size[1]},
+            'scale': '1',
+            'buttons': list(skins),
+            'states': list(BUTTON_STATES),
+        },
+    }
+    return texture, atlas
+
+
+def encode_atlas(atlas):
+    return (json.dumps(atlas, indent=2, ensure_ascii=False) + '\n').encode('utf-8')
+
+
+def write_button_skins(skins, writer):
+    """打包按钮皮肤并交给后台写出"""
+    texture, atlas = pack_button_skins(skins)
+    writer.submit(texture, BUTTONS_TEXTURE, frames=len(atlas['frames']))
+    writer.submit_bytes(encode_atlas(atlas), BUTTONS_ATLAS)
+    return texture, atlas
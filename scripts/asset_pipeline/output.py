@@ -0,0 +1,156 @@
+"""
+素材输出：可复现编码、内容哈希文件名与素材清单
+
+同样的输入总是得到逐字节相同的 PNG（固定压缩参数、不写时间戳和多余元数据），
+文件名中带内容哈希（如 cards.3f2a9c1b7d.png），因此可以配合长期 immutable 缓存。
+客户端通过 asset-manifest.json 把逻辑名映射到实际文件。
+
+写出新清单后，同一逻辑名（含之前清单中已不再生成的逻辑名）下新清单和上一代清单都不再引用的哈希文件会被删除。
+上一代清单另存为 asset-manifest.previous.json，它引用的文件保留到下一次内容变化，
+刚加载旧清单的客户端不会取到已删除的文件；素材目录最多保留两代，其他文件不受影响。
+"""
+
+import hashlib
+import io
+import json
+import os
+import re
+import tempfile
+
+# 清单文件名固定，不带哈希（它本身需要短缓存）
+MANIFEST_NAME = "asset-manifest.json"
+# 上一代清单的副本：决定清理时保留哪些旧文件
+PREVIOUS_MANIFEST_NAME = "asset-manifest.previous.json"
+MANIFEST_VERSION = 1
+
+# 文件名中保留的哈希长度（十六进制字符）
+HASH_LENGTH = 10
+
+# 固定的 PNG 编码参数：optimize 会使用最高压缩级别，结果与运行环境无关
+PNG_PARAMS = {'optimize': True, 'compress_level': 9}
+
+# 编码时保留的图像元数据（调色板图需要 transparency）
+_KEPT_INFO = ('transparency',)
+
+
+def encode_png(img):
+    """以固定参数把图像编码成 PNG 字节串"""
+    clean = img.copy()
+    clean.info = {k: v for k, v in img.info.items() if k in _KEPT_INFO}
+    buf = io.BytesIO()
+    clean.save(buf, 'PNG', **PNG_PARAMS)
+    return buf.getvalue()
+
+
+def content_hash(data):
+    """计算内容哈希"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hashed_filename(logical_name, data):
+    """生成带内容哈希的文件名：cards.png -> cards.<hash>.png"""
+    stem, ext = os.path.splitext(logical_name)
+    return f"{stem}.{content_hash(data)[:HASH_LENGTH]}{ext}"
+
+
+class AssetManifest:
+    """素材清单：逻辑名 -> 哈希文件及元数据"""
+
+    def __init__(self):
+        self.assets = {}
+        self.pruned = []
+
+    def add(self, logical_name, filename, data, **meta):
+        """登记一个已写出的素材"""
+        entry = {
+            'file': filename,
+            'sha256': content_hash(data),
+            'bytes': len(data),
+        }
+        entry.update(meta)
+        self.assets[logical_name] = entry
+        return entry
+
+    def to_dict(self):
+        return {'version': MANIFEST_VERSION, 'assets': self.assets}
+
+    def write(self, assets_dir, prune=True):
+        """写出清单（键排序、无时间戳，保证可复现），并删除新清单和上一代清单都不再引用的哈希文件"""
+        path = os.path.join(assets_dir, MANIFEST_NAME)
+        current = read_manifest(assets_dir)
+        previous = read_manifest(assets_dir, PREVIOUS_MANIFEST_NAME)
+        logical_names = set(self.assets) | set(current) | set(previous)
+        # 内容有变化时现有清单成为上一代；重复生成相同内容时上一代不变
+        if current != json.loads(json.dumps(self.assets)):
+            previous = current
+
+        atomic_write(path, _encode_manifest(self.to_dict()))
+        atomic_write(os.path.join(assets_dir, PREVIOUS_MANIFEST_NAME),
+                     _encode_manifest({'version': MANIFEST_VERSION, 'assets': previous}))
+        if prune:
+            # 先写新清单再删旧文件；上一代清单引用的文件保留到下一次内容变化，
+            # 刚读到旧清单的客户端仍能取到它们
+            referenced = {entry['file'] for entry in self.assets.values()}
+            referenced.update(entry['file'] for entry in previous.values() if 'file' in entry)
+            self.pruned = prune_stale_files(assets_dir, logical_names, referenced)
+        return path
+
+
+def _encode_manifest(manifest):
+    return (json.dumps(manifest, indent=2, sort_keys=True, ensure_ascii=False) + '\n').encode('utf-8')
+
+
+def read_manifest(assets_dir, name=MANIFEST_NAME):
+    """读取目录中已有清单的 assets（没有或无法解析时返回空 dict）"""
+    try:
+        with open(os.path.join(assets_dir, name), encoding='utf-8') as f:
+            return json.load(f).get('assets', {})
+    except (OSError, ValueError):
+        return {}
+
+
+def prune_stale_files(assets_dir, logical_names, referenced):
+    """删除这些逻辑名的哈希文件中未被引用的那些，返回删除的文件名（相对 assets_dir）"""
+    removed = []
+    for logical_name in sorted(logical_names):
+        subdir, base = os.path.split(logical_name)
+        stem, ext = os.path.splitext(base)
+        pattern = re.compile(rf"{re.escape(stem)}\.[0-9a-f]{{{HASH_LENGTH}}}{re.escape(ext)}")
+        directory = os.path.join(assets_dir, subdir)
+        if not os.path.isdir(directory):
+            continue
+        for name in os.listdir(directory):
+            filename = os.path.join(subdir, name) if subdir else name
+            if pattern.fullmatch(name) and filename not in referenced:
+                os.remove(os.path.join(directory, name))
+                removed.append(filename)
+    return removed
+
+
+def atomic_write(path, data):
+    """先写临时文件再重命名，读者不会看到写了一半的文件"""
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        # mkstemp 创建的文件只有属主可读，素材需要能被静态服务器读取
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_asset_bytes(data, assets_dir, logical_name, manifest, **meta):
+    """把已编码的数据写成哈希文件名并登记到清单"""
+    filename = hashed_filename(logical_name, data)
+    atomic_write(os.path.join(assets_dir, filename), data)
+    manifest.add(logical_name, filename, data, **meta)
+    return filename
+
+
+def save_asset(img, assets_dir, logical_name, manifest, **meta):
+    """编码图像、写成哈希文件名并登记到清单，返回实际文件名"""
+    return write_asset_bytes(encode_png(img), assets_dir, logical_name, manifest, **meta)
@@ -0,0 +1,141 @@
+"""
+16 位纹理导出（RGBA4444 / RGBA5551）
+
+解码后的 RGBA 纹理在 GPU 上每像素 4 字节，档位越高占用越多。低端手机可以改用每像素 2 字节的格式：
+
+- rgba4444：每通道 4 位，保留半透明边缘
+- rgba5551：RGB 各 5 位（与 RGB565 相同的色深）+ 1 位 alpha，适合只有硬边透明的纹理
+
+数据按 WebGL 的 UNSIGNED_SHORT_4_4_4_4 / UNSIGNED_SHORT_5_5_5_1 位布局存成小端 u16，
+客户端读成 Uint16Array 即可直接 texImage2D 上传。文件头（小端，16 字节）：
+
+    偏移  类型  内容
+    0     4s    魔数 b'RTEX'
+    4     u8    版本（1）
+    5     u8    格式：1 = rgba4444，2 = rgba5551
+    6     u8    标志：bit0 = 颜色已预乘 alpha
+    7     u8    保留
+    8     u16   宽
+    10    u16   高
+    12    u32   像素数据字节数
+
+降低色深时用 4×4 有序抖动，但针对牌面的大面积纯色和平缓渐变做了调整：
+与上下左右四个邻居相差不到半个色阶的像素直接取最近色阶，纯色区域不产生棋盘格噪点，
+平缓渐变也不会在色阶交界处出现一行行的抖动点；只有抗锯齿边缘等明显的颜色变化处才抖动。
+"""
+
+import struct
+
+import numpy as np
+
+PACKED_VERSION = 1
+PACKED_MAGIC = b'RTEX'
+
+# 格式名 -> (格式编号, 文件扩展名)
+PACKED_FORMATS = {
+    'rgba4444': (1, '.rgba4444.tex'),
+    'rgba5551': (2, '.rgba5551.tex'),
+}
+
+FLAG_PREMULTIPLIED = 1
+
+_HEADER = struct.Struct('<4sBBBBHHI')
+
+# 4×4 Bayer 矩阵，阈值取 (k + 0.5) / 16
+BAYER_4 = (np.array([[0, 8, 2, 10],
+                     [12, 4, 14, 6],
+                     [3, 11, 1, 9],
+                     [15, 7, 13, 5]], dtype=np.float32) + 0.5) / 16
+
+
+def flat_mask(pixels, bits):
+    """各通道与上下左右四个邻居相差不到目标色深半个色阶的像素（边界按复制处理）"""
+    tolerance = 255.0 / ((1 << bits) - 1) / 2
+    padded = np.pad(pixels.astype(np.int16), ((1, 1), (1, 1), (0, 0)), mode='edge')
+    center = padded[1:-1, 1:-1]
+    flat = np.ones(pixels.shape[:2], dtype=bool)
+    for neighbour in (padded[:-2, 1:-1], padded[2:, 1:-1], padded[1:-1, :-2], padded[1:-1, 2:]):
+        flat &= (np.abs(center - neighbour) < tolerance).all(axis=-1)
+    return flat
+
+
+def dither(values, bits, flat):
+    """values: (高, 宽, C) 取值 0-255 的浮点数组 -> 0 .. 2^bits-1 的 uint16 色阶"""
+    levels = (1 << bits) - 1
+    height, width = values.shape[:2]
+    scaled = values * (levels / 255.0)
+    threshold = np.tile(BAYER_4, (height // 4 + 1, width // 4 + 1))[:height, :width, None]
+    quantized = np.where(flat[..., None], np.floor(scaled + 0.5), np.floor(scaled + threshold))
+    return np.clip(quantized, 0, levels).astype(np.uint16)
+
+
+def pack_rgba4444(pixels, premultiplied=True):
+    """(高, 宽, 4) uint8 RGBA -> (高, 宽) u16，位布局 RRRRGGGGBBBBAAAA"""
+    flat = flat_mask(pixels, 4)
+    values = pixels.astype(np.float32)
+    if premultiplied:
+        values[..., :3] *= values[..., 3:4] / 255.0
+    q = dither(values, 4, flat)
+    if premultiplied:
+        # 各通道分别取整后颜色可能超过 alpha，预乘混合时会发亮
+        q[..., :3] = np.minimum(q[..., :3], q[..., 3:4])
+    return (q[..., 0] << 12) | (q[..., 1] << 8) | (q[..., 2] << 4) | q[..., 3]
+
+
+def pack_rgba5551(pixels, premultiplied=True):
+    """(高, 宽, 4) uint8 RGBA -> (高, 宽) u16，位布局 RRRRRGGGGGBBBBBA
+
+    alpha 只有 1 位，按 50% 取阈值（边缘抖动会变成毛刺）；透明像素颜色置 0，
+    因此结果同时也是预乘的，premultiplied 只影响文件头标志。
+    """
+    opaque = pixels[..., 3] >= 128
+    rgb = dither(pixels[..., :3].astype(np.float32), 5, flat_mask(pixels, 5))
+    rgb[~opaque] = 0
+    return (rgb[..., 0] << 11) | (rgb[..., 1] << 6) | (rgb[..., 2] << 1) | opaque.astype(np.uint16)
+
+
+_PACKERS = {'rgba4444': pack_rgba4444, 'rgba5551': pack_rgba5551}
+
+
+def encode_packed_texture(pixels, fmt, premultiplied=True):
+    """RGBA 像素 -> 带文件头的 16 位纹理字节串"""
+    code, _ = PACKED_FORMATS[fmt]
+    data = _PACKERS[fmt](pixels, premultiplied).astype('<u2').tobytes()
+    height, width = pixels.shape[:2]
+    flags = FLAG_PREMULTIPLIED if premultiplied or fmt == 'rgba5551' else 0
+    return _HEADER.pack(PACKED_MAGIC, PACKED_VERSION, code, flags, 0, width, height, len(data)) + data
+
+
+def decode_packed_texture(data):
+    """解析 16 位纹理，返回 (格式名, 是否预乘, (高, 宽, 4) uint8 RGBA)，用于校验"""
+    magic, version, code, flags, _, width, height, length = _HEADER.unpack_from(data)
+    if magic != PACKED_MAGIC or version != PACKED_VERSION:
+        raise ValueError("不是有效的 16 位纹理文件")
+    fmt = next(name for name, (value, _) in PACKED_FORMATS.items() if value == code)
+    words = np.frombuffer(data, '<u2', length // 2, _HEADER.size).reshape(height, width).astype(np.uint32)
+
+    if fmt == 'rgba4444':
+        channels = [(words >> shift) & 0xF for shift in (12, 8, 4, 0)]
+        rgba = np.stack(channels, axis=-1) * 17
+    else:
+        channels = [(words >> shift) & 0x1F for shift in (11, 6, 1)]
+        rgb = (np.stack(channels, axis=-1) * 255 + 15) // 31
+        rgba = np.concatenate([rgb, (words & 1)[..., None] * 255], axis=-1)
+    return fmt, bool(flags & FLAG_PREMULTIPLIED), rgba.astype(np.uint8)
+
+
+def write_packed_textures(pixels, logical_name, writer, formats=tuple(PACKED_FORMATS), premultiplied=True):
+    """把一张 RGBA 纹理导出成各 16 位格式（如 cards.png -> cards.rgba4444.tex）交给后台写出，返回 Future 列表"""
+    stem = logical_name.rsplit('.', 1)[0]
+    futures = []
+    for fmt in formats:
+        data = encode_packed_texture(pixels, fmt, premultiplied)
+        futures.append(writer.submit_bytes(data, stem + PACKED_FORMATS[fmt][1], format=fmt,
+                                           width=pixels.shape[1], height=pixels.shape[0]))
+    return futures
+
+
+def write_packed_sheet(pages, index, writer, formats=tuple(PACKED_FORMATS), premultiplied=True):
+    """精灵表各页分别导出：cards.png -> cards.rgba4444.tex，cards-1.png -> cards-1.rgba4444.tex"""
+    return [write_packed_textures(pixels, page['image'], writer, formats, premultiplied)
+            for pixels, page in zip(pages, index['pages'])]
@@ -0,0 +1,188 @@
+"""
+调色板（索引色）PNG
+
+牌面只用到主题 COLORS 中的少量颜色，再加上它们之间和边缘处的抗锯齿过渡，
+按 32 位 RGBA 存储很浪费。这里为整张精灵表求一个不超过 256 色的调色板，
+写成带 tRNS 的 8 位索引 PNG：文件更小，所有浏览器都能解码，客户端解码后的内存也更少。
+
+- 图中实际出现的主题颜色和全透明固定进调色板，不参与迭代，保证大面积纯色完全无损
+- 半透明像素按 alpha 分段求平均颜色，作为 alpha 过渡的初始调色板项
+- 剩余位置用加权最远点补齐，再在预乘 RGBA 空间做加权 Lloyd 迭代
+- 不同颜色本来就不超过 256 种时直接使用精确调色板
+- 调色板按 alpha 升序排列，tRNS 只需覆盖半透明的前几项
+
+所有运算只在不重复颜色（通常几千种）上进行，与图像尺寸无关。
+"""
+
+import json
+
+import numpy as np
+from PIL import Image
+
+MAX_COLORS = 256
+# 半透明过渡按 alpha 分成的段数
+RAMP_LEVELS = 16
+LLOYD_ITERATIONS = 12
+# 最近调色板项计算按颜色分块，控制 (颜色, 调色板) 距离矩阵的内存
+_CHUNK = 4096
+
+
+def palette_seeds(colors):
+    """主题配色 dict -> 调色板种子 RGBA 列表（RGB 视为不透明）"""
+    seeds = []
+    for color in colors.values():
+        rgba = tuple(color) if len(color) == 4 else (*color, 255)
+        if rgba not in seeds:
+            seeds.append(rgba)
+    return seeds
+
+
+def _pack(rgba):
+    """(..., 4) uint8 -> uint32 颜色键"""
+    return np.ascontiguousarray(rgba, dtype=np.uint8).view('<u4')[..., 0]
+
+
+def _premultiplied(rgba):
+    rgba = rgba.astype(np.float32)
+    rgba[:, :3] *= rgba[:, 3:4] / 255.0
+    return rgba
+
+
+def _straight(premultiplied):
+    alpha = premultiplied[:, 3:4]
+    rgb = np.divide(premultiplied[:, :3] * 255.0, alpha, out=np.zeros_like(premultiplied[:, :3]),
+                    where=alpha > 0)
+    return np.rint(np.clip(np.concatenate([rgb, alpha], axis=1), 0, 255)).astype(np.uint8)
+
+
+def _nearest(points, palette):
+    """每个点在调色板中最近项的下标和平方距离"""
+    index = np.empty(len(points), dtype=np.intp)
+    dist2 = np.empty(len(points), dtype=np.float32)
+    norms = (palette ** 2).sum(axis=1)
+    for start in range(0, len(points), _CHUNK):
+        chunk = points[start:start + _CHUNK]
+        d = norms[None, :] - 2.0 * chunk @ palette.T + (chunk ** 2).sum(axis=1)[:, None]
+        index[start:start + len(chunk)] = d.argmin(axis=1)
+        dist2[start:start + len(chunk)] = np.maximum(d.min(axis=1), 0.0)
+    return index, dist2
+
+
+def build_palette(pixels, seeds=(), max_colors=MAX_COLORS, iterations=LLOYD_ITERATIONS):
+    """pixels: (..., 4) uint8 RGBA，返回 (调色板 (K, 4) uint8, 是否精确)"""
+    keys, counts = np.unique(_pack(pixels.reshape(-1, 4)), return_counts=True)
+    colors = keys[:, None].view(np.uint8).reshape(-1, 4)
+    if len(colors) <= max_colors:
+        return _sorted(colors), True
+
+    points = _premultiplied(colors)
+    weights = counts.astype(np.float32)
+
+    # 固定项：实际出现的种子颜色和全透明
+    present = set(keys.tolist())
+    fixed = [seed for seed in seeds if _pack(np.array(seed, dtype=np.uint8)[None])[0] in present]
+    if colors[:, 3].min() == 0:
+        fixed.append((0, 0, 0, 0))
+    fixed = np.array(fixed[:max_colors], dtype=np.uint8).reshape(-1, 4)
+    palette = [_premultiplied(fixed)]
+
+    # alpha 过渡：半透明颜色按 alpha 分段取加权平均
+    partial = (colors[:, 3] > 0) & (colors[:, 3] < 255)
+    levels = colors[:, 3].astype(np.intp) * RAMP_LEVELS // 256
+    ramp = [np.average(points[partial & (levels == level)], axis=0,
+                       weights=weights[partial & (levels == level)])
+            for level in range(RAMP_LEVELS) if (partial & (levels == level)).any()]
+    if ramp:
+        palette.append(np.array(ramp[:max_colors - len(fixed)], dtype=np.float32))
+    palette = np.concatenate(palette)
+
+    # 加权最远点：每次加入"数量 × 误差²"最大的颜色
+    _, dist2 = _nearest(points, palette)
+    extra = []
+    while len(palette) + len(extra) < max_colors:
+        score = weights * dist2
+        best = int(score.argmax())
+        if score[best] <= 0:
+            break
+        extra.append(points[best])
+        dist2 = np.minimum(dist2, ((points - points[best]) ** 2).sum(axis=1))
+    if extra:
+        palette = np.concatenate([palette, np.array(extra)])
+
+    # 加权 Lloyd 迭代，固定项保持不动
+    fixed_count = len(fixed)
+    for _ in range(iterations):
+        index, _ = _nearest(points, palette)
+        total = np.zeros_like(palette)
+        np.add.at(total, index, points * weights[:, None])
+        mass = np.bincount(index, weights=weights, minlength=len(palette))[:, None]
+        moved = np.divide(total, mass, out=palette.copy(), where=mass > 0)
+        moved[:fixed_count] = palette[:fixed_count]
+        if np.allclose(moved, palette, atol=0.05):
+            break
+        palette = moved
+
+    palette = np.unique(_straight(palette), axis=0)
+    return _sorted(palette), False
+
+
+def _sorted(palette):
+    """按 alpha 升序（半透明项在前，tRNS 可以截短），同 alpha 内保持颜色顺序"""
+    return palette[np.argsort(palette[:, 3], kind='stable')]
+
+
+def quantize(pixels, palette):
+    """把 RGBA 像素映射到调色板，返回 uint8 下标数组（形状同 pixels[..., 0]）"""
+    keys, inverse = np.unique(_pack(pixels.reshape(-1, 4)), return_inverse=True)
+    colors = keys[:, None].view(np.uint8).reshape(-1, 4)
+    index, _ = _nearest(_premultiplied(colors), _premultiplied(palette))
+    return index[inverse.ravel()].astype(np.uint8).reshape(pixels.shape[:-1])
+
+
+def indexed_image(indices, palette):
+    """下标数组 + 调色板 -> 带 tRNS 的 P 模式图像"""
+    img = Image.fromarray(indices, 'P')
+    img.putpalette(palette[:, :3].tobytes(), 'RGB')
+    alphas = palette[:, 3]
+    translucent = np.flatnonzero(alphas < 255)
+    if len(translucent):
+        img.info['transparency'] = alphas[:translucent[-1] + 1].tobytes()
+    return img
+
+
+def frame_errors(original, quantized, frame_size, count):
+    """精灵表中每帧的量化误差（预乘 RGBA，0-255）：[(均方根误差, 最大误差)]"""
+    frame_width, frame_height = frame_size
+    cols = original.shape[1] // frame_width
+    diff = np.abs(_premultiplied(original.reshape(-1, 4)) - _premultiplied(quantized.reshape(-1, 4)))
+    diff = diff.reshape(original.shape)
+    errors = []
+    for i in range(count):
+        y, x = (i // cols) * frame_height, (i % cols) * frame_width
+        cell = diff[y:y + frame_height, x:x + frame_width]
+        errors.append((float(np.sqrt((cell ** 2).mean())), float(cell.max())))
+    return errors
+
+
+def quantize_sheet(sheet, seeds, frame_size, names):
+    """把精灵表转成索引色图像，返回 (P 图像, 量化报告)"""
+    pixels = np.asarray(sheet.convert('RGBA'))
+    palette, exact = build_palette(pixels, seeds)
+    indices = quantize(pixels, palette)
+    errors = frame_errors(pixels, palette[indices], frame_size, len(names))
+
+    report = {
+        'colors': len(palette),
+        'exact': exact,
+        'seeds': len(seeds),
+        'metric': 'premultiplied RGBA, 0-255',
+        'maxRmse': round(max(rmse for rmse, _ in errors), 3),
+        'maxError': round(max(peak for _, peak in errors), 3),
+        'frames': [{'name': name, 'rmse': round(rmse, 3), 'max': round(peak, 3)}
+                   for name, (rmse, peak) in zip(names, errors)],
+    }
+    return indexed_image(indices, palette), report
+
+
+def encode_report(report):
+    return (json.dumps(report, indent=2, ensure_ascii=False) + '\n').encode('utf-8')
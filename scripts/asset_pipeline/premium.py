@@ -0,0 +1,558 @@
+"""
+专业版卡牌生成器
+
+布局坐标使用 6x 设计尺寸（420×570），scale 决定实际输出分辨率；
+牌面带渐变和阴影，卡背由缓存的图层合成。
+generate_premium_assets.py、多主题生成和进程内渲染都从这里创建生成器。
+"""
+
+from PIL import Image, ImageDraw, ImageFilter
+
+from .build_graph import scoped_name
+from .cache import TEMPLATE_CACHE
+from .fonts import load_font, text_size
+from .nine_slice import BUTTON_STATES, skin_width, state_color
+from .raster import ShapeCanvas, scaled_font
+
+# 专业级配色方案
+COLORS = {
+    # 卡牌颜色
+    'red': (220, 20, 60),           # 鲜艳红色 (红心/方块)
+    'black': (28, 28, 30),          # 深黑色 (黑桃/草花)
+    'white': (255, 255, 255),       # 纯白
+    'off_white': (250, 250, 250),   # 微灰白
+    
+    # 背景渐变
+    'card_bg_start': (248, 248, 248),
+    'card_bg_end': (238, 238, 238),
+    'card_border': (200, 200, 200),
+    'card_shadow': (0, 0, 0, 40),   # 带透明度的阴影
+    
+    # 王牌特殊配色
+    'joker_bg': (25, 25, 35),
+    'joker_gold': (255, 215, 0),
+    'joker_silver': (192, 192, 192),
+    
+    # 卡背配色
+    'back_primary': (30, 60, 120),
+    'back_secondary': (50, 80, 140),
+    'back_accent': (220, 180, 50),
+    'back_pattern': (40, 70, 130),
+    
+    # UI元素
+    'ui_green': (76, 175, 80),
+    'ui_red': (244, 67, 54),
+    'ui_blue': (33, 150, 243),
+    'ui_shadow': (0, 0, 0, 80),
+}
+
+# 花色符号和Unicode字符
+SUITS = {
+    'spades': '♠',      # 黑桃
+    'hearts': '♥',      # 红心  
+    'diamonds': '♦',    # 方块
+    'clubs': '♣'        # 梅花
+}
+
+# 更完整的rank映射
+RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
+RANK_NAMES = {
+    'J': 'JACK',
+    'Q': 'QUEEN', 
+    'K': 'KING',
+    'A': 'ACE'
+}
+
+# 高分辨率尺寸
+CARD_WIDTH = 420    # 6x原始尺寸，超高清
+CARD_HEIGHT = 570
+CORNER_RADIUS = 60
+BORDER_WIDTH = 8
+
+# 牌面和卡背用到的 (字号, 是否粗体)（设计尺寸），构建时预先加载
+FONT_SIZES = ((16, False), (18, False), (24, True), (32, True), (36, True),
+              (64, True), (80, True), (100, True), (120, True))
+
+# 卡背钻石图案：无缝图块的设计尺寸（横向两个间距 × 纵向两个间距）、钻石大小，
+# 以及平铺范围（覆盖以卡背中心为原点的 9 行 × 7 列棋盘格）
+BACK_TILE_SIZE = (100, 80)
+BACK_DIAMOND_SIZE = 20
+BACK_PATTERN_BOX = (CARD_WIDTH // 2 - 175, CARD_HEIGHT // 2 - 180, CARD_WIDTH // 2 + 175, CARD_HEIGHT // 2 + 180)
+
+class PremiumCardGenerator:
+    def __init__(self, colors=None, scale=1.0):
+        # 布局坐标始终使用 6x 设计尺寸，scale 决定实际输出分辨率
+        # （scale=1 输出 420×570 母版，scale=1/6 直接输出 70×95）
+        self.card_width = CARD_WIDTH
+        self.card_height = CARD_HEIGHT
+        self.scale = scale
+        # 主题配色：在默认配色基础上覆盖
+        self.colors = dict(COLORS)
+        self.colors.update(colors or {})
+    
+    def new_canvas(self, width=None, height=None):
+        """按当前 scale 创建抗锯齿画布"""
+        return ShapeCanvas(width or self.card_width, height or self.card_height, self.scale)
+        
+    def get_font(self, size, bold=False):
+        """获取高质量字体"""
+        font_paths = (
+            # macOS系统字体
+            "/System/Library/Fonts/Helvetica.ttc",
+            "/System/Library/Fonts/Arial.ttf", 
+            "/Library/Fonts/Arial.ttf",
+            # Linux字体
+            "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf" if bold else "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+            "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf" if bold else "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
+        )
+        
+        # 找不到时回退到默认字体
+        return load_font(font_paths, size)
+    
+    def preload_fonts(self):
+        """预先加载牌面用到的字体（含按 scale 缩放后的字号）"""
+        return [scaled_font(self.get_font(size, bold), self.scale) for size, bold in FONT_SIZES]
+    
+    def preload_templates(self):
+        """预先渲染普通牌和王牌的底板模板"""
+        self.create_card_base(is_joker=False)
+        self.create_card_base(is_joker=True)
+    
+    def create_gradient_background(self, start_color, end_color):
+        """创建渐变背景"""
+        canvas = self.new_canvas()
+        
+        # 创建垂直渐变（按行插值，整行填充）
+        canvas.vertical_gradient(start_color, end_color)
+                
+        return canvas
+    
+    def add_card_shadow(self, img):
+        """添加卡牌阴影效果"""
+        # 创建阴影图层
+        shadow = Image.new('RGBA', (self.card_width + 20, self.card_height + 20), (0, 0, 0, 0))
+        shadow_draw = ImageDraw.Draw(shadow)
+        
+        # 绘制阴影
+        shadow_draw.rounded_rectangle(
+            [15, 15, self.card_width + 15, self.card_height + 15],
+            radius=CORNER_RADIUS,
+            fill=self.colors['card_shadow']
+        )
+        
+        # 应用模糊效果
+        shadow = shadow.filter(ImageFilter.GaussianBlur(radius=8))
+        
+        # 合并阴影和卡牌
+        result = Image.new('RGBA', (self.card_width + 20, self.card_height + 20), (0, 0, 0, 0))
+        result.paste(shadow, (0, 0), shadow)
+        result.paste(img, (10, 10), img)
+        
+        return result
+    
+    def create_card_base(self, is_joker=False):
+        """创建高质量卡牌基础"""
+        if is_joker:
+            key = ('premium', self.scale, 'joker', self.colors['joker_bg'], self.colors['joker_gold'])
+        else:
+            key = ('premium', self.scale, 'card',
+                   self.colors['card_bg_start'], self.colors['card_bg_end'], self.colors['card_border'])
+        
+        # 渐变背景和边框按配色缓存为模板，每张牌在副本上绘制
+        template = TEMPLATE_CACHE.get(key, lambda: self._render_card_base(is_joker))
+        return template.copy()
+    
+    def _render_card_base(self, is_joker):
+        if is_joker:
+            # 王牌使用深色渐变背景
+            draw = self.create_gradient_background(self.colors['joker_bg'], (35, 35, 45))
+        else:
+            # 普通卡牌使用浅色渐变背景
+            draw = self.create_gradient_background(self.colors['card_bg_start'], self.colors['card_bg_end'])
+        
+        # 绘制圆角矩形边框
+        if is_joker:
+            border_color = self.colors['joker_gold']
+        else:
+            border_color = self.colors['card_border']
+            
+        # 外边框
+        draw.rounded_rectangle(
+            [BORDER_WIDTH//2, BORDER_WIDTH//2, 
+             self.card_width - BORDER_WIDTH//2, self.card_height - BORDER_WIDTH//2],
+            radius=CORNER_RADIUS,
+            outline=border_color,
+            width=BORDER_WIDTH
+        )
+        
+        # 内边框（添加层次感）
+        draw.rounded_rectangle(
+            [BORDER_WIDTH + 4, BORDER_WIDTH + 4, 
+             self.card_width - BORDER_WIDTH - 4, self.card_height - BORDER_WIDTH - 4],
+            radius=CORNER_RADIUS - 8,
+            outline=border_color,
+            width=2
+        )
+        
+        return draw
+    
+    def draw_suit_symbol(self, draw, x, y, suit, size=60, color=None):
+        """绘制精美的花色符号"""
+        font = self.get_font(size, bold=True)
+        symbol = SUITS[suit]
+        color = color or self.colors['black']
+        
+        # 获取文本尺寸
+        text_width, text_height = text_size(font, symbol)
+        
+        # 添加阴影效果
+        shadow_offset = max(2, size // 30)
+        draw.draw_text((x - text_width//2 + shadow_offset, y - text_height//2 + shadow_offset), 
+                       symbol, font, (0, 0, 0, 60))
+        
+        # 绘制主符号
+        draw.draw_text((x - text_width//2, y - text_height//2), symbol, font, color)
+    
+    def draw_rank_text(self, draw, x, y, rank, size=48, color=None, bold=True):
+        """绘制精美的牌面值"""
+        font = self.get_font(size, bold=bold)
+        color = color or self.colors['black']
+        
+        # 获取文本尺寸
+        text_width, text_height = text_size(font, rank)
+        
+        # 添加阴影效果
+        shadow_offset = max(1, size // 40)
+        draw.draw_text((x - text_width//2 + shadow_offset, y - text_height//2 + shadow_offset), 
+                       rank, font, (0, 0, 0, 60))
+        
+        # 绘制主文字
+        draw.draw_text((x - text_width//2, y - text_height//2), rank, font, color)
+    
+    def create_suit_pattern_for_number(self, draw, rank, suit, color):
+        """为数字牌创建精美的花色图案"""
+        center_x = self.card_width // 2
+        center_y = self.card_height // 2
+        symbol_size = 36
+        
+        try:
+            num = int(rank)
+        except:
+            return
+        
+        # 定义每种数字的图案布局
+        patterns = {
+            2: [(center_x, center_y - 80), (center_x, center_y + 80)],
+            3: [(center_x, center_y - 80), (center_x, center_y), (center_x, center_y + 80)],
+            4: [(center_x - 40, center_y - 60), (center_x + 40, center_y - 60),
+                (center_x - 40, center_y + 60), (center_x + 40, center_y + 60)],
+            5: [(center_x - 40, center_y - 60), (center_x + 40, center_y - 60), (center_x, center_y),
+                (center_x - 40, center_y + 60), (center_x + 40, center_y + 60)],
+            6: [(center_x - 40, center_y - 60), (center_x + 40, center_y - 60),
+                (center_x - 40, center_y), (center_x + 40, center_y),
+                (center_x - 40, center_y + 60), (center_x + 40, center_y + 60)],
+            7: [(center_x - 40, center_y - 60), (center_x + 40, center_y - 60),
+                (center_x, center_y - 30), (center_x - 40, center_y), (center_x + 40, center_y),
+                (center_x - 40, center_y + 60), (center_x + 40, center_y + 60)],
+            8: [(center_x - 40, center_y - 80), (center_x + 40, center_y - 80),
+                (center_x - 40, center_y - 25), (center_x + 40, center_y - 25),
+                (center_x - 40, center_y + 25), (center_x + 40, center_y + 25),
+                (center_x - 40, center_y + 80), (center_x + 40, center_y + 80)],
+            9: [(center_x - 40, center_y - 80), (center_x + 40, center_y - 80),
+                (center_x - 40, center_y - 40), (center_x + 40, center_y - 40),
+                (center_x, center_y), (center_x - 40, center_y + 40), (center_x + 40, center_y + 40),
+                (center_x - 40, center_y + 80), (center_x + 40, center_y + 80)],
+            10: [(center_x - 40, center_y - 80), (center_x + 40, center_y - 80),
+                 (center_x - 40, center_y - 40), (center_x + 40, center_y - 40),
+                 (center_x - 40, center_y), (center_x + 40, center_y),
+                 (center_x - 40, center_y + 40), (center_x + 40, center_y + 40),
+                 (center_x - 40, center_y + 80), (center_x + 40, center_y + 80)]
+        }
+        
+        if num in patterns:
+            for x, y in patterns[num]:
+                self.draw_suit_symbol(draw, x, y, suit, symbol_size, color)
+    
+    def create_number_card(self, rank, suit):
+        """创建高质量数字/字母牌"""
+        return self.compose_number_card(rank, suit).to_image()
+    
+    def compose_number_card(self, rank, suit):
+        """绘制数字/字母牌，返回画布（含绘制指令）"""
+        draw = self.create_card_base()
+        
+        # 确定颜色
+        color = self.colors['red'] if suit in ['hearts', 'diamonds'] else self.colors['black']
+        
+        # 绘制四个角的标识
+        margin = 30
+        small_rank_size = 36
+        small_suit_size = 24
+        
+        # 左上角
+        self.draw_rank_text(draw, margin + 20, margin + 25, rank, small_rank_size, color)
+        self.draw_suit_symbol(draw, margin + 20, margin + 60, suit, small_suit_size, color)
+        
+        # 右下角（旋转180度的效果）
+        right_x = self.card_width - margin - 20
+        bottom_y = self.card_height - margin - 25
+        self.draw_rank_text(draw, right_x, bottom_y, rank, small_rank_size, color)
+        self.draw_suit_symbol(draw, right_x, self.card_height - margin - 60, suit, small_suit_size, color)
+        
+        # 绘制中心图案
+        if rank in ['J', 'Q', 'K', 'A']:
+            # 人头牌和A的特殊处理
+            center_x = self.card_width // 2
+            center_y = self.card_height // 2
+            
+            if rank == 'A':
+                # A牌：大花色符号
+                self.draw_suit_symbol(draw, center_x, center_y, suit, 120, color)
+            else:
+                # 人头牌：大花色符号 + 标识
+                self.draw_suit_symbol(draw, center_x, center_y - 20, suit, 80, color)
+                self.draw_rank_text(draw, center_x, center_y + 60, rank, 64, color)
+                
+                # 添加人头牌标识
+                if rank in RANK_NAMES:
+                    name_font = self.get_font(16)
+                    name = RANK_NAMES[rank]
+                    name_width, _ = text_size(name_font, name)
+                    draw.draw_text((center_x - name_width//2, center_y + 100), 
+                                   name, name_font, color)
+        else:
+            # 数字牌：绘制对应数量的花色符号
+            self.create_suit_pattern_for_number(draw, rank, suit, color)
+        
+        return draw
+    
+    def create_joker_card(self, is_red=False):
+        """创建高质量王牌"""
+        return self.compose_joker_card(is_red).to_image()
+    
+    def compose_joker_card(self, is_red=False):
+        """绘制王牌，返回画布（含绘制指令）"""
+        draw = self.create_card_base(is_joker=True)
+        
+        center_x = self.card_width // 2
+        center_y = self.card_height // 2
+        
+        if is_red:
+            # 大王
+            primary_color = self.colors['joker_gold']
+            secondary_color = self.colors['red']
+            text = "大王"
+            symbol = "★"
+            english = "BIG JOKER"
+        else:
+            # 小王
+            primary_color = self.colors['joker_silver']
+            secondary_color = self.colors['white']
+            text = "小王"
+            symbol = "☆"
+            english = "SMALL JOKER"
+        
+        # 绘制装饰圆环
+        draw.ellipse([center_x - 80, center_y - 80, center_x + 80, center_y + 80],
+                    outline=primary_color, width=6)
+        draw.ellipse([center_x - 70, center_y - 70, center_x + 70, center_y + 70],
+                    outline=secondary_color, width=3)
+        
+        # 绘制大星星符号
+        star_font = self.get_font(100, bold=True)
+        star_width, star_height = text_size(star_font, symbol)
+        
+        # 星星阴影
+        draw.draw_text((center_x - star_width//2 + 3, center_y - star_height//2 - 15 + 3), 
+                       symbol, star_font, (0, 0, 0, 100))
+        # 星星主体
+        draw.draw_text((center_x - star_width//2, center_y - star_height//2 - 15), 
+                       symbol, star_font, primary_color)
+        
+        # 绘制中文字
+        chinese_font = self.get_font(36, bold=True)
+        text_width, _ = text_size(chinese_font, text)
+        draw.draw_text((center_x - text_width//2, center_y + 40), 
+                       text, chinese_font, primary_color)
+        
+        # 绘制英文字
+        english_font = self.get_font(18)
+        english_width, _ = text_size(english_font, english)
+        draw.draw_text((center_x - english_width//2, center_y + 80), 
+                       english, english_font, secondary_color)
+        
+        return draw
+    
+    def create_premium_card_back(self):
+        """创建高质量卡背：底板、同心圆、平铺的钻石图案和 logo 由缓存的图层合成"""
+        draw = self._back_layer('base', self._render_back_base).copy()
+        
+        center_x = self.card_width // 2
+        center_y = self.card_height // 2
+        
+        # 多层同心圆
+        rings = self._back_layer('rings', self._render_back_rings)
+        draw.composite(rings, (center_x - rings.width // 2, center_y - rings.height // 2))
+        
+        # 钻石图案：范围为 9×7 网格，(0, 0) 处的钻石落在卡背中心。
+        # 图块周期是整像素时平铺无缝图块；否则（如游戏尺寸 1/6 缩放下 100×80 → 16.67×13.33 像素）
+        # 逐块取整的误差会累积，直接绘制网格
+        origin = (center_x - BACK_TILE_SIZE[0] // 4, center_y - BACK_TILE_SIZE[1] // 4)
+        if draw.pixel_aligned(*BACK_TILE_SIZE, *origin):
+            draw.fill_tiled(self.create_back_tile(), BACK_PATTERN_BOX, origin=origin)
+        else:
+            self.draw_back_diamonds(draw, center_x, center_y)
+        
+        # 中心logo
+        logo = self._back_layer('logo', self._render_back_logo)
+        draw.composite(logo, (center_x - logo.width // 2, center_y - logo.height // 2))
+        
+        return draw.to_image()
+    
+    def create_card_back(self):
+        """与经典版生成器同名的卡背接口（牌组规格中的自定义卡背帧使用）"""
+        return self.create_premium_card_back()
+    
+    def create_back_tile(self):
+        """卡背的钻石图案无缝图块（透明底），客户端也可以直接用它平铺桌面背景"""
+        return self._back_layer('tile', self._render_back_tile)
+    
+    def _back_layer(self, name, render):
+        """卡背图层按 scale 和配色缓存，不同尺寸、主题之间复用"""
+        key = ('premium-back', name, self.scale, self.colors['back_primary'], self.colors['back_secondary'],
+               self.colors['back_accent'], self.colors['back_pattern'], self.colors['white'])
+        return TEMPLATE_CACHE.get(key, render)
+    
+    def _render_back_base(self):
+        draw = self.create_gradient_background(self.colors['back_primary'], self.colors['back_secondary'])
+        
+        # 绘制边框
+        draw.rounded_rectangle(
+            [BORDER_WIDTH//2, BORDER_WIDTH//2, 
+             self.card_width - BORDER_WIDTH//2, self.card_height - BORDER_WIDTH//2],
+            radius=CORNER_RADIUS,
+            outline=self.colors['back_accent'],
+            width=BORDER_WIDTH
+        )
+        return draw
+    
+    def _render_back_rings(self):
+        # 5 层同心圆，由内到外逐渐变淡
+        size = 2 * (40 + 4 * 25) + 2
+        center = size // 2
+        rings = self.new_canvas(size, size)
+        for i in range(5):
+            radius = 40 + i * 25
+            alpha = 100 - i * 15
+            color = (*self.colors['back_accent'][:3], alpha)
+            rings.ellipse([center - radius, center - radius, 
+                           center + radius, center + radius],
+                          outline=color, width=3)
+        return rings
+    
+    def _render_back_tile(self):
+        # 钻石按棋盘格排列：横向间距 50、纵向间距 40，一个周期内两颗
+        tile_width, tile_height = BACK_TILE_SIZE
+        tile = self.new_canvas(tile_width, tile_height)
+        for x, y in ((tile_width // 4, tile_height // 4), (tile_width * 3 // 4, tile_height * 3 // 4)):
+            self.draw_back_diamond(tile, x, y)
+        return tile
+    
+    def draw_back_diamonds(self, draw, center_x, center_y):
+        """直接绘制 9 行 × 7 列棋盘格的钻石网格（与平铺图块的结果相同）"""
+        spacing_x, spacing_y = BACK_TILE_SIZE[0] // 2, BACK_TILE_SIZE[1] // 2
+        for row in range(-4, 5):
+            for col in range(-3, 4):
+                if (row + col) % 2 == 0:
+                    self.draw_back_diamond(draw, center_x + col * spacing_x, center_y + row * spacing_y)
+    
+    def draw_back_diamond(self, draw, x, y):
+        half = BACK_DIAMOND_SIZE // 2
+        diamond_points = [(x, y - half), (x + half, y), (x, y + half), (x - half, y)]
+        draw.polygon(diamond_points, fill=self.colors['back_pattern'], 
+                     outline=self.colors['back_accent'], width=1)
+    
+    def _render_back_logo(self):
+        # 160×80 的半透明圆角底板
+        logo = self.new_canvas(160, 80)
+        logo.rounded_rectangle([0, 0, 159, 79], radius=15, 
+                               fill=self.colors['back_accent'] + (180,))
+        
+        # 绘制"掼蛋"文字
+        logo_font = self.get_font(32, bold=True)
+        logo_text = "掼蛋"
+        logo_width, logo_height = text_size(logo_font, logo_text)
+        
+        logo.draw_text((80 - logo_width//2, 40 - logo_height//2), 
+                       logo_text, logo_font, self.colors['white'])
+        return logo
+
+def create_premium_button_skins():
+    """绘制带渐变和阴影的按钮九宫格皮肤：{按钮名: {状态: (图像, insets)}}"""
+    button_height = 40
+    corner_radius = 12
+    shadow_margin = 10
+    
+    # 九宫格皮肤：按钮主体只保留圆角和边框宽度，右下额外包含阴影边距
+    inset = corner_radius + 2
+    body_width = skin_width(inset, inset)
+    
+    def create_button(color, state, text_color=COLORS['white']):
+        """绘制带渐变和阴影的九宫格按钮皮肤，返回 (图像, insets)"""
+        color = state_color(color, state)
+        
+        # 阴影：按下时阴影贴近按钮，看起来像被按下去
+        shadow_offset = 1 if state == 'pressed' else 3
+        shadow = ShapeCanvas(body_width, button_height)
+        shadow.rounded_rectangle([0, 0, body_width - 1, button_height - 1],
+                                 radius=corner_radius, fill=(0, 0, 0, 80))
+        shadow = shadow.to_image().filter(ImageFilter.GaussianBlur(radius=2))
+        
+        # 按钮主体：渐变背景（底部压暗 30%）
+        button = ShapeCanvas(body_width, button_height)
+        button.vertical_gradient(color, tuple(c * 0.7 for c in color[:3]))
+        
+        # 绘制边框
+        button.rounded_rectangle([0, 0, body_width - 1, button_height - 1],
+                                 radius=corner_radius,
+                                 outline=state_color(text_color, state), width=2)
+        
+        # 高光效果（禁用状态不加高光）
+        if state != 'disabled':
+            button.rounded_rectangle([2, 2, body_width - 3, button_height // 2],
+                                     radius=corner_radius - 2,
+                                     fill=(255, 255, 255, 30))
+        
+        # 渐变裁剪到圆角内
+        button.clip_rounded_rectangle([0, 0, body_width - 1, button_height - 1], corner_radius)
+        
+        # 合并所有层
+        skin = Image.new('RGBA', (body_width + shadow_margin, button_height + shadow_margin), (0, 0, 0, 0))
+        skin.alpha_composite(shadow, (shadow_offset, shadow_offset))
+        skin.alpha_composite(button.to_image())
+        
+        return skin, (inset, inset, inset + shadow_margin, inset + shadow_margin)
+    
+    # 创建各种按钮的全部状态，打包成一张纹理
+    button_colors = {
+        'play': COLORS['ui_green'],
+        'pass': COLORS['ui_red'],
+        'tribute': COLORS['ui_blue'],
+    }
+    return {
+        name: {state: create_button(color, state) for state in BUTTON_STATES}
+        for name, color in button_colors.items()
+    }
+
+def write_premium_back_tile(generator, writer, log=print):
+    """写出卡背钻石图案的无缝图块（母版分辨率），客户端可用来平铺大面积桌面背景"""
+    # 牌面按游戏尺寸渲染，图块另用母版 scale 的同配色生成器绘制
+    tile = PremiumCardGenerator(colors=generator.colors).create_back_tile()
+    future = writer.submit(tile.to_image(), "card-back-tile.png", designWidth=tile.width, designHeight=tile.height)
+    log(f"卡背图块 {tile.size[0]}×{tile.size[1]} 已加入写出队列")
+    return future
+
+def add_back_tile_task(graph, generator, writer, log=print, scope=None):
+    """在 card_asset_graph 建立的构建图上追加卡背图块任务（与卡背同时进行）"""
+    graph.add(scoped_name(scope, 'back:tile'), lambda back: write_premium_back_tile(generator, writer, log),
+              deps=[scoped_name(scope, 'back')])
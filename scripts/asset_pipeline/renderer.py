@@ -0,0 +1,101 @@
+"""
+进程内渲染接口
+
+不写文件，直接返回像素缓冲区，供测试、基准和本地素材服务在同一进程里复用：
+
+    from asset_pipeline.renderer import render_face, render_back, render_sheet
+
+    face = render_face('K', 'hearts', theme='premium', scale=2)   # (190, 140, 4) uint8
+    joker = render_face('big', 'joker')                           # 大王
+    png_free = memoryview(face)                                   # 缓冲区协议，无拷贝
+
+scale 以游戏内 1x 尺寸（70×95）为基准，取输出档位的倍数（1、2、3），各档位直接在目标分辨率渲染。
+返回的是 NumPy 数组（非预乘 RGBA，行优先、内存连续），支持缓冲区协议；
+结果按 (主题, scale, ...) 缓存并以只读方式共享，重复调用不会重新渲染也不会拷贝，
+需要修改时请先 .copy()。
+"""
+
+import numpy as np
+
+from .cache import SharedCache
+from .deck import compose_face, frame_name, standard_deck_frames, unique_frames
+from .sheet import OUTPUT_TIERS, SHEET_COLS, assemble_sheet_array
+from .themes import THEMES, make_generator, render_theme_back
+
+# 可渲染的帧名（普通牌 + 小王/大王）
+FACE_NAMES = frozenset(standard_deck_frames(decks=1))
+
+# 可用的 scale 即输出档位的倍数，缓存的条目数因此有上限
+SCALE_TIERS = {factor: tier for tier, factor in OUTPUT_TIERS.items()}
+
+
+def _shared(array):
+    """缓存中的数组只读共享，避免调用方改坏其他使用者看到的结果"""
+    array.flags.writeable = False
+    return array
+
+
+class CardRenderer:
+    """保持生成器和渲染结果常驻的渲染器；线程安全，可在线程池中并发调用"""
+
+    def __init__(self):
+        self.generators = SharedCache('renderer-generators')
+        self.buffers = SharedCache('renderer-buffers')
+
+    def generator(self, theme, scale=1):
+        """主题在指定 scale 下的生成器（同一参数只创建一次）"""
+        if theme not in THEMES:
+            raise ValueError(f"未知的主题: {theme}")
+        if scale not in SCALE_TIERS:
+            raise ValueError(f"scale 必须是输出档位的倍数之一 {sorted(SCALE_TIERS)}: {scale}")
+        return self.generators.get((theme, scale), lambda: make_generator(theme, SCALE_TIERS[scale]))
+
+    def face(self, name, theme='classic', scale=1):
+        """按帧名渲染牌面"""
+        if name not in FACE_NAMES:
+            raise ValueError(f"未知的牌面: {name}")
+        generator = self.generator(theme, scale)
+        return self.buffers.get(('face', theme, scale, name),
+                                lambda: _shared(compose_face(generator, name).to_array()))
+
+    def back(self, theme='classic', scale=1):
+        generator = self.generator(theme, scale)
+        return self.buffers.get(('back', theme, scale),
+                                lambda: _shared(np.asarray(render_theme_back(theme, generator))))
+
+    def sheet(self, theme='classic', scale=1, decks=2, cols=SHEET_COLS):
+        """精灵表像素；帧顺序与 standard_deck_frames(decks) 相同"""
+        def build():
+            frames = standard_deck_frames(decks)
+            names = unique_frames(frames)
+            index = {name: i for i, name in enumerate(names)}
+            faces = np.stack([self.face(name, theme, scale) for name in names])
+            return _shared(assemble_sheet_array(faces, [index[name] for name in frames], cols))
+
+        return self.buffers.get(('sheet', theme, scale, decks, cols), build)
+
+    def clear(self):
+        self.generators.clear()
+        self.buffers.clear()
+
+    def stats(self):
+        return {cache.name: cache.stats() for cache in (self.generators, self.buffers)}
+
+
+# 进程内共享的默认渲染器
+default_renderer = CardRenderer()
+
+
+def render_face(rank, suit, theme='classic', scale=1):
+    """渲染一张牌面；王牌用 suit='joker'，rank 为 'small' 或 'big'"""
+    return default_renderer.face(frame_name(suit, rank), theme, scale)
+
+
+def render_back(theme='classic', scale=1):
+    """渲染卡背"""
+    return default_renderer.back(theme, scale)
+
+
+def render_sheet(theme='classic', scale=1, decks=2, cols=SHEET_COLS):
+    """渲染整张精灵表（decks 副牌，cols 列）"""
+    return default_renderer.sheet(theme, scale, decks, cols)
@@ -0,0 +1,96 @@
+"""
+批量缩放
+
+把所有不重复的卡牌母版堆成一个数组，用可分离的滤波矩阵一次性缩放：
+先在预乘 alpha 空间里对行、列各做一次矩阵乘法（走 BLAS，多核机器上自动并行），
+再还原为非预乘颜色。
+预乘保证透明区域的颜色不会渗进圆角边缘，避免出现暗边或彩边。
+"""
+
+import numpy as np
+
+# 每批处理的母版数，控制浮点中间结果的内存占用
+CHUNK_SIZE = 8
+
+LANCZOS_LOBES = 3
+
+
+def lanczos_weights(src, dst, lobes=LANCZOS_LOBES):
+    """src -> dst 一维 Lanczos 重采样矩阵，形状 (dst, src)，每行归一化"""
+    scale = src / dst
+    # 缩小时滤波核按比例展宽，起到抗混叠作用
+    stretch = max(scale, 1.0)
+
+    centers = (np.arange(dst) + 0.5) * scale
+    taps = np.arange(src) + 0.5
+    x = (taps[None, :] - centers[:, None]) / stretch
+    weights = np.sinc(x) * np.sinc(x / lobes)
+    weights[np.abs(x) >= lobes] = 0.0
+    weights /= weights.sum(axis=1, keepdims=True)
+    return weights.astype(np.float32)
+
+
+def area_weights(src, dst):
+    """src -> dst 一维面积平均矩阵（按像素覆盖比例加权），形状 (dst, src)"""
+    scale = src / dst
+    starts = np.arange(dst) * scale
+    ends = starts + scale
+    left = np.arange(src)
+    overlap = np.minimum(ends[:, None], left[None, :] + 1) - np.maximum(starts[:, None], left[None, :])
+    weights = np.clip(overlap, 0.0, None)
+    weights /= weights.sum(axis=1, keepdims=True)
+    return weights.astype(np.float32)
+
+
+FILTERS = {
+    'lanczos': lanczos_weights,
+    'area': area_weights,
+}
+
+
+def stack_images(images):
+    """把尺寸相同的 RGBA 图像堆成 (N, H, W, 4) 的 uint8 数组"""
+    return np.stack([np.asarray(img.convert('RGBA')) for img in images])
+
+
+def _resample_chunk(chunk, row_weights, col_weights):
+    count, src_height, src_width, channels = chunk.shape
+    pixels = chunk.astype(np.float32) * (1.0 / 255.0)
+    pixels[..., :3] *= pixels[..., 3:4]
+
+    # 先缩行（数据量先变小）再缩列：(N, H, W, C) -> (N, h, W, C) -> (N, h, w, C)
+    pixels = np.matmul(row_weights, pixels.reshape(count, src_height, src_width * channels))
+    pixels = np.matmul(col_weights, pixels.reshape(count, -1, src_width, channels))
+
+    # Lanczos 的负瓣会产生轻微过冲，裁剪后再还原非预乘颜色
+    alpha = np.clip(pixels[..., 3:4], 0.0, 1.0)
+    rgb = np.clip(pixels[..., :3], 0.0, alpha)
+    rgb = np.divide(rgb, alpha, out=np.zeros_like(rgb), where=alpha > 0)
+
+    out = np.concatenate([rgb, alpha], axis=-1)
+    return np.rint(out * 255.0).astype(np.uint8)
+
+
+def downsample_batch(images, size, method='lanczos', out=None):
+    """把一组同尺寸母版缩放到 size=(宽, 高)，返回 (N, 高, 宽, 4) 的 uint8 数组"""
+    masters = stack_images(images)
+    count, src_height, src_width, _ = masters.shape
+    width, height = size
+
+    # 已经是目标尺寸（例如直接在目标分辨率渲染的牌面）时无需重采样
+    if (src_width, src_height) == (width, height):
+        if out is None:
+            return masters
+        out[...] = masters
+        return out
+
+    make_weights = FILTERS[method]
+    row_weights = make_weights(src_height, height)
+    col_weights = make_weights(src_width, width)
+
+    if out is None:
+        out = np.empty((count, height, width, 4), dtype=np.uint8)
+    for start in range(0, count, CHUNK_SIZE):
+        chunk = masters[start:start + CHUNK_SIZE]
+        out[start:start + len(chunk)] = _resample_chunk(chunk, row_weights, col_weights)
+    return out
@@ -0,0 +1,173 @@
+"""
+精灵表拼接
+
+两个生成器共用同一个拼接逻辑，按输出档位（1x、2x...）把高清母版批量缩放后排成网格。
+其他图集（字形、状态帧）共用这里的货架式装箱。
+
+帧数不固定（3-4 副牌、级牌标记、自定义卡背）时用 paginate_sheet：自动选接近正方形的网格，
+超过最大纹理边长就分成多页（cards.png、cards-1.png ...），并生成帧名 -> (页, 坐标) 的索引。
+"""
+
+import json
+import math
+
+import numpy as np
+from PIL import Image
+
+from .resample import downsample_batch
+
+# 游戏中单张卡牌的基础尺寸（1x）
+FRAME_WIDTH = 70
+FRAME_HEIGHT = 95
+
+# 输出档位：档位名 -> 相对 1x 的倍数
+OUTPUT_TIERS = {'1x': 1, '2x': 2, '3x': 3}
+
+# 108 张牌排成 12×9 网格
+SHEET_COLS = 12
+
+# 单页精灵表的最大边长（常见 GPU 的 MAX_TEXTURE_SIZE；低端设备可传 2048）
+MAX_TEXTURE_SIZE = 4096
+
+SHEET_INDEX_VERSION = 1
+SHEET_INDEX_NAME = "cards.index.json"
+
+
+def tier_size(tier):
+    """档位对应的单帧尺寸"""
+    factor = OUTPUT_TIERS[tier]
+    return FRAME_WIDTH * factor, FRAME_HEIGHT * factor
+
+
+def tier_filename(logical_name, tier):
+    """档位文件名：1x 保持原名，其他档位加 @2x 之类的后缀"""
+    if tier == '1x':
+        return logical_name
+    stem, dot, ext = logical_name.rpartition('.')
+    return f"{stem}@{tier}.{ext}"
+
+
+def downsample_frames(cards, frame_size, method='lanczos'):
+    """把母版缩放到 frame_size，重复的母版（两副牌）只缩放一次
+
+    返回 (不重复帧数组 (N, 高, 宽, 4), 每张牌对应的帧下标)；帧按首次出现的顺序排列。
+    """
+    unique = {}
+    for card in cards:
+        unique.setdefault(id(card), (len(unique), card))
+    frames = downsample_batch([card for _, card in unique.values()], frame_size, method)
+    indices = np.array([unique[id(card)][0] for card in cards])
+    return frames, indices
+
+
+def assemble_sheet_array(frames, indices, cols=SHEET_COLS):
+    """按下标把帧排成网格，返回 (高, 宽, 4) 的 uint8 数组"""
+    _, frame_height, frame_width, _ = frames.shape
+    rows = (len(indices) + cols - 1) // cols
+
+    # 直接写入精灵表缓冲区：(行, 帧高, 列, 帧宽, 4) 视图上按格子整块赋值
+    sheet = np.zeros((rows, frame_height, cols, frame_width, 4), dtype=np.uint8)
+    positions = np.arange(len(indices))
+    sheet[positions // cols, :, positions % cols, :] = frames[indices]
+    return sheet.reshape(rows * frame_height, cols * frame_width, 4)
+
+
+def assemble_spritesheet(frames, indices, cols=SHEET_COLS):
+    """按下标把帧排成网格，返回精灵表图像"""
+    return Image.fromarray(assemble_sheet_array(frames, indices, cols), 'RGBA')
+
+
+def build_spritesheet(cards, frame_size, cols=SHEET_COLS, method='lanczos'):
+    """把卡牌母版缩放到 frame_size 并排成网格，返回精灵表图像"""
+    # 所有不重复母版一起批量缩放
+    frames, indices = downsample_frames(cards, frame_size, method)
+    return assemble_spritesheet(frames, indices, cols)
+
+
+def sheet_grid(count, frame_size, cols=None, max_size=MAX_TEXTURE_SIZE):
+    """为 count 帧选网格，返回 [(起始帧, 帧数, 列数, 行数)]，每项一页
+
+    未指定 cols 时取使精灵表接近正方形的列数（108 帧 70×95 时为 12 列 × 9 行）；
+    一页放不下时改用 max_size 允许的最多列数，按页依次填满，最后一页只保留用到的行。
+    """
+    if cols is not None and cols < 1:
+        raise ValueError(f"精灵表列数必须至少为 1: {cols}")
+    frame_width, frame_height = frame_size
+    max_cols, max_rows = max_size // frame_width, max_size // frame_height
+    if max_cols < 1 or max_rows < 1:
+        raise ValueError(f"单帧 {frame_width}×{frame_height} 超过最大纹理边长 {max_size}px")
+    if cols is None:
+        cols = max(1, round(math.sqrt(count * frame_height / frame_width)))
+        if math.ceil(count / cols) > max_rows:
+            cols = max_cols
+        cols = min(cols, max_cols, max(count, 1))
+    elif cols > max_cols:
+        raise ValueError(f"{cols} 列宽 {cols * frame_width}px，超过最大纹理边长 {max_size}px")
+
+    per_page = cols * max_rows
+    pages = []
+    for start in range(0, max(count, 1), per_page):
+        frames = min(per_page, count - start)
+        pages.append((start, frames, cols, max(1, math.ceil(frames / cols))))
+    return pages
+
+
+def sheet_page_name(logical_name, page):
+    """第 0 页保持原名（cards.png），之后为 cards-1.png、cards-2.png ..."""
+    if page == 0:
+        return logical_name
+    stem, dot, ext = logical_name.rpartition('.')
+    return f"{stem}-{page}.{ext}"
+
+
+def paginate_sheet(frames, indices, names, cols=None, max_size=MAX_TEXTURE_SIZE, logical_name="cards.png"):
+    """按下标把帧排成一页或多页网格，返回 (各页 (高, 宽, 4) uint8 数组, 帧索引)
+
+    帧索引中 frames 的每一项为 [帧名, 页, x, y]（字段见 frameFields），
+    帧名重复时（两副牌）各保留一项，顺序与精灵表帧号一致。
+    """
+    _, frame_height, frame_width, _ = frames.shape
+    indices = np.asarray(indices)
+    grid = sheet_grid(len(indices), (frame_width, frame_height), cols, max_size)
+
+    pages, entries, page_info = [], [], []
+    for page, (start, count, page_cols, rows) in enumerate(grid):
+        pages.append(assemble_sheet_array(frames, indices[start:start + count], page_cols))
+        page_info.append({'image': sheet_page_name(logical_name, page), 'first': start, 'count': count,
+                          'cols': page_cols, 'rows': rows})
+        for position in range(count):
+            entries.append([names[start + position], page,
+                            position % page_cols * frame_width, position // page_cols * frame_height])
+
+    index = {
+        'version': SHEET_INDEX_VERSION,
+        'frameWidth': frame_width,
+        'frameHeight': frame_height,
+        'maxTextureSize': max_size,
+        'pages': page_info,
+        'frameFields': ['name', 'page', 'x', 'y'],
+        'frames': entries,
+    }
+    return pages, index
+
+
+def encode_sheet_index(index):
+    return json.dumps(index, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def pack_shelves(sizes, width, gap=1):
+    """按高度从大到小的货架式装箱，返回每个矩形的左上角和总高度"""
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], i))
+    positions = [None] * len(sizes)
+    x = y = shelf_height = 0
+    for i in order:
+        w, h = sizes[i]
+        if w > width:
+            raise ValueError(f"宽 {w}px 超过图集宽度 {width}px")
+        if x + w > width:
+            x, y = 0, y + shelf_height + gap
+            shelf_height = 0
+        positions[i] = (x, y)
+        x += w + gap
+        shelf_height = max(shelf_height, h)
+    return positions, y + shelf_height
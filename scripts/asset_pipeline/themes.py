@@ -0,0 +1,95 @@
+"""
+主题配置
+
+主题 = 生成器类型 + 配色覆盖。批量生成（generate_themes.py）和进程内渲染（renderer.py）
+共用这里的主题表和生成器工厂。
+"""
+
+from . import classic, premium
+from .card_assets import card_asset_graph
+from .sheet import tier_size
+
+# 生成器类型 -> 生成器类、卡背方法名，以及与对应生成脚本（generate_assets.py /
+# generate_premium_assets.py）相同的素材参数：按钮皮肤工厂、牌面圆角、旧版按钮尺寸和附加任务
+GENERATORS = {
+    'classic': {
+        'class': classic.CardGenerator,
+        'back': 'create_card_back',
+        'buttons': classic.create_button_skins,
+        'corner_radius': classic.CORNER_RADIUS,
+        'button_size': (120, 40),
+        'extra_tasks': None,
+    },
+    'premium': {
+        'class': premium.PremiumCardGenerator,
+        'back': 'create_premium_card_back',
+        'buttons': premium.create_premium_button_skins,
+        'corner_radius': premium.CORNER_RADIUS,
+        'button_size': (120 + 10, 40 + 10),
+        'extra_tasks': premium.add_back_tile_task,
+    },
+}
+
+# 主题：生成器类型 + 配色覆盖
+THEMES = {
+    'classic': {'generator': 'classic'},
+    'premium': {'generator': 'premium'},
+    # 春节：红金卡背
+    'spring_festival': {
+        'generator': 'premium',
+        'colors': {
+            'back_primary': (150, 20, 30),
+            'back_secondary': (185, 35, 40),
+            'back_accent': (255, 200, 60),
+            'back_pattern': (170, 30, 35),
+            'joker_gold': (255, 190, 40),
+        },
+    },
+    # 冬季：冰蓝牌面和卡背
+    'winter': {
+        'generator': 'premium',
+        'colors': {
+            'card_bg_start': (246, 250, 255),
+            'card_bg_end': (226, 236, 248),
+            'card_border': (170, 190, 215),
+            'back_primary': (40, 90, 140),
+            'back_secondary': (90, 140, 190),
+            'back_accent': (225, 240, 255),
+            'back_pattern': (60, 110, 160),
+        },
+    },
+}
+
+
+def make_generator(theme, tier=None):
+    """按主题配置创建生成器；指定 tier 时生成器直接输出该档位分辨率"""
+    if theme not in THEMES:
+        raise ValueError(f"未知的主题: {theme}")
+    spec = THEMES[theme]
+    generator = GENERATORS[spec['generator']]['class'](colors=spec.get('colors'))
+    if tier is not None:
+        generator.scale = tier_size(tier)[0] / generator.card_width
+    return generator
+
+
+def render_theme_back(theme, generator):
+    """用主题对应生成器类型的卡背方法绘制卡背"""
+    return getattr(generator, GENERATORS[THEMES[theme]['generator']]['back'])()
+
+
+def add_theme_assets(graph, theme, tier, writer, log=print, **options):
+    """把一个主题在一个档位下的全套素材任务加到构建图里，任务名带 "<主题>@<档位>" 范围
+
+    节点和主生成脚本完全相同（索引色精灵表、点击遮罩、状态帧、16 位纹理、布局表、按钮等），
+    只是生成器直接按档位分辨率渲染；素材以不带主题和档位的逻辑名交给 writer，由 writer 决定最终文件名。
+    其余参数（indexed、spec、cols、max_size）原样传给 card_asset_graph。
+    """
+    generator = make_generator(theme, tier)
+    config = GENERATORS[THEMES[theme]['generator']]
+    scope = f"{theme}@{tier}"
+    card_asset_graph(writer, generator, getattr(config['class'], config['back']), config['buttons'],
+                     corner_radius=config['corner_radius'], button_size=config['button_size'], log=log,
+                     frame_size=tier_size(tier), graph=graph, scope=scope, **options)
+    if config['extra_tasks']:
+        config['extra_tasks'](graph, generator, writer, log, scope)
+    return scope
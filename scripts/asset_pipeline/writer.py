@@ -0,0 +1,122 @@
+"""
+后台编码写出
+
+PNG 压缩是生成过程中最慢的单步之一。BackgroundWriter 把渲染好的图像交给线程池编码、
+原子写出并登记到清单，主线程同时继续渲染下一个素材。待处理任务数有上限，
+超过时 submit 会阻塞（背压），避免大量整图堆积在内存里。
+
+submit 可以从多个构建线程同时调用；调用方不应在构建任务里等待返回的 Future，
+而是交给 close 统一等待，这样所有等待都计入 blocked_seconds。
+多套素材共用一个写出队列和清单时，用 ScopedWriter 给各自的逻辑名加上前缀或后缀。
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .output import encode_png, write_asset_bytes
+
+
+class BackgroundWriter:
+    """后台 PNG 编码与写出"""
+
+    def __init__(self, assets_dir, manifest, workers=2, max_pending=4):
+        self.assets_dir = assets_dir
+        self.manifest = manifest
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='asset-writer')
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._futures = []
+        self.files = {}
+        # 统计：后台编码/写入耗时，提交方因背压和收尾等待的时间（各线程累计）
+        self.encode_seconds = 0.0
+        self.write_seconds = 0.0
+        self.blocked_seconds = 0.0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # 出错时也要等后台任务结束，但不覆盖原始异常
+        self.close(raise_errors=exc_type is None)
+
+    def submit(self, img, logical_name, **meta):
+        """提交一个待写出的图像；队列满时阻塞，返回 Future（结果为实际文件名）"""
+        return self._submit(encode_png, img, logical_name, meta)
+
+    def submit_bytes(self, data, logical_name, **meta):
+        """提交已编码好的数据（如 JSON 布局表），与图像共用写出队列和清单"""
+        return self._submit(None, data, logical_name, meta)
+
+    def _submit(self, encode, payload, logical_name, meta):
+        start = time.perf_counter()
+        self._slots.acquire()
+        with self._lock:
+            self.blocked_seconds += time.perf_counter() - start
+
+        try:
+            future = self._pool.submit(self._encode_and_write, encode, payload, logical_name, meta)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        with self._lock:
+            self._futures.append(future)
+        return future
+
+    def _encode_and_write(self, encode, payload, logical_name, meta):
+        start = time.perf_counter()
+        data = encode(payload) if encode else payload
+        encoded = time.perf_counter()
+        filename = write_asset_bytes(data, self.assets_dir, logical_name, self.manifest, **meta)
+        written = time.perf_counter()
+
+        with self._lock:
+            self.encode_seconds += encoded - start
+            self.write_seconds += written - encoded
+            self.files[logical_name] = filename
+        return filename
+
+    def close(self, raise_errors=True):
+        """等待所有写出完成，有任务失败时抛出第一个异常"""
+        start = time.perf_counter()
+        self._pool.shutdown(wait=True)
+        with self._lock:
+            self.blocked_seconds += time.perf_counter() - start
+
+        if raise_errors:
+            for future in self._futures:
+                future.result()
+
+    def summary(self):
+        """编码写出统计：hidden_seconds 为没有阻塞主线程、被渲染掩盖掉的后台时间"""
+        busy = self.encode_seconds + self.write_seconds
+        hidden = max(0.0, busy - self.blocked_seconds)
+        return {
+            'files': len(self.files),
+            'encode_seconds': round(self.encode_seconds, 3),
+            'write_seconds': round(self.write_seconds, 3),
+            'blocked_seconds': round(self.blocked_seconds, 3),
+            'hidden_seconds': round(hidden, 3),
+            'hidden_ratio': round(hidden / busy, 3) if busy else 0.0,
+        }
+
+    def format_summary(self):
+        stats = self.summary()
+        return (f"{stats['files']} 个文件, 编码 {stats['encode_seconds']}s, "
+                f"写入 {stats['write_seconds']}s, 主线程等待 {stats['blocked_seconds']}s, "
+                f"被渲染掩盖 {stats['hidden_seconds']}s ({stats['hidden_ratio']:.0%})")
+
+
+class ScopedWriter:
+    """共享 BackgroundWriter 的命名视图：逻辑名经 rename 映射后再提交（如 cards.png -> winter/cards@2x.png）"""
+
+    def __init__(self, writer, rename):
+        self.writer = writer
+        self.rename = rename
+
+    def submit(self, img, logical_name, **meta):
+        return self.writer.submit(img, self.rename(logical_name), **meta)
+
+    def submit_bytes(self, data, logical_name, **meta):
+        return self.writer.submit_bytes(data, self.rename(logical_name), **meta)
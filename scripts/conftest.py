@@ -0,0 +1,18 @@
+"""
+素材管线测试的公共夹具
+
+pytest 会把本目录（scripts/）加入 sys.path，测试因此可以直接导入 asset_pipeline。
+"""
+
+import pytest
+
+from asset_pipeline.card_assets import FINAL_SIZE, downscale_faces
+from asset_pipeline.classic import CARD_WIDTH, CardGenerator
+from asset_pipeline.deck import render_deck
+
+
+@pytest.fixture(scope='session')
+def classic_frames():
+    """经典版标准牌组在游戏尺寸下的 (不重复帧 (54, 95, 70, 4), 108 帧的帧下标)"""
+    generator = CardGenerator(scale=FINAL_SIZE[0] / CARD_WIDTH)
+    return downscale_faces(render_deck(generator))
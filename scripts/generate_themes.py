@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+多主题批量素材生成器
+一次运行生成 主题 × 输出档位 的全套素材，和 generate_assets.py / generate_premium_assets.py 的输出一致
+（索引色精灵表、点击遮罩、状态帧、16 位纹理、字形图集和布局表、按钮），各档位直接在目标分辨率渲染
+
+所有 主题 × 档位 的任务放进同一张构建图，由同一个线程池调度、同一个后台写出器写出；
+字体、字形、模板缓存在主题之间共享，绘制指令相同的牌面（如只改卡背配色的主题）只渲染一次
+"""
+
+import argparse
+import json
+import os
+import time
+
+from asset_pipeline.build_graph import BuildGraph
+from asset_pipeline.cache import cache_stats
+from asset_pipeline.card_assets import BUILD_CACHE_DIR
+from asset_pipeline.cli import positive_int
+from asset_pipeline.output import AssetManifest
+from asset_pipeline.sheet import OUTPUT_TIERS, tier_filename
+from asset_pipeline.themes import THEMES, add_theme_assets
+from asset_pipeline.writer import BackgroundWriter, ScopedWriter
+
+DEFAULT_TIERS = ['1x', '2x']
+REPORT_NAME = "theme-report.json"
+
+
+def theme_filename(theme, tier, logical_name):
+    """主题素材在汇总清单中的逻辑名：<主题>/<档位文件名>，如 winter/cards@2x.png"""
+    return f"{theme}/{tier_filename(logical_name, tier)}"
+
+
+def build_themes(themes, tiers, output_dir, workers=None, cache_dir=None):
+    """生成 主题 × 档位 矩阵，返回报告"""
+    start = time.perf_counter()
+    manifest = AssetManifest()
+    graph = BuildGraph(cache_dir)
+
+    for theme in themes:
+        os.makedirs(os.path.join(output_dir, theme), exist_ok=True)
+
+    with BackgroundWriter(output_dir, manifest) as writer:
+        scopes = {}
+        for theme in themes:
+            for tier in tiers:
+                scoped = ScopedWriter(writer, lambda name, theme=theme, tier=tier: theme_filename(theme, tier, name))
+                # 各素材的量化误差等明细写在输出文件里，这里只打印汇总报告
+                scopes[(theme, tier)] = add_theme_assets(graph, theme, tier, scoped, log=lambda message: None)
+        graph.run(workers)
+
+    manifest.write(output_dir)
+
+    report = {theme: {'generator': THEMES[theme]['generator'], 'outputs': {}} for theme in themes}
+    for (theme, tier), scope in scopes.items():
+        report[theme]['outputs'][tier] = {
+            'cards': writer.files[theme_filename(theme, tier, 'cards.png')],
+            'card_back': writer.files[theme_filename(theme, tier, 'card_back.png')],
+            'render_seconds': round(graph.timings[f"{scope}/faces"] + graph.timings[f"{scope}/back"], 3),
+            # 从进程内缓存（其他主题的相同任务）或磁盘缓存直接取得结果的任务
+            'cached': sorted(name.split('/', 1)[1] for name in graph.cached if name.startswith(scope + '/')),
+        }
+    return {
+        'themes': report,
+        'tiers': list(tiers),
+        'workers': workers,
+        'pruned': len(manifest.pruned),
+        'writer': writer.summary(),
+        'critical_path': graph.format_critical_path(),
+        'wall_seconds': round(time.perf_counter() - start, 3),
+        'caches': cache_stats(),
+    }
+
+
+def print_report(report):
+    print("\n📊 主题生成报告")
+    for theme, info in report['themes'].items():
+        tiers = ', '.join(f"{tier}: {out['cards']} ({out['render_seconds']}s)" for tier, out in info['outputs'].items())
+        print(f"  - {theme} ({info['generator']}): {tiers}")
+    for name, stats in report['caches'].items():
+        print(f"  缓存 {name}: {stats['entries']} 项, 命中 {stats['hits']}, 未命中 {stats['misses']}")
+    writer = report['writer']
+    print(f"  写出 {writer['files']} 个文件, 主线程等待 {writer['blocked_seconds']}s")
+    print(f"  已清理 {report['pruned']} 个不再引用的旧文件")
+    print(f"  关键路径: {report['critical_path']}")
+    print(f"  总耗时: {report['wall_seconds']}s")
+
+
+def main():
+    """主函数"""
+    default_output = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                  '..', 'client', 'assets', 'themes')
+
+    parser = argparse.ArgumentParser(description="批量生成多主题掼蛋素材")
+    parser.add_argument('--themes', nargs='+', choices=sorted(THEMES), default=list(THEMES),
+                        help="要生成的主题（默认全部）")
+    parser.add_argument('--tiers', nargs='+', choices=sorted(OUTPUT_TIERS), default=DEFAULT_TIERS,
+                        help="输出档位（默认 1x 2x）")
+    parser.add_argument('--workers', type=positive_int, default=None, help="构建线程数（默认 CPU 核数 + 4）")
+    parser.add_argument('--output', default=default_output, help="输出目录")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="不读写构建缓存（默认缓存在 scripts/.build-cache）")
+    args = parser.parse_args()
+
+    output_dir = os.path.normpath(args.output)
+    os.makedirs(output_dir, exist_ok=True)
+
+    print(f"🎨 生成主题: {', '.join(args.themes)} × 档位: {', '.join(args.tiers)}")
+    report = build_themes(args.themes, args.tiers, output_dir, args.workers,
+                          cache_dir=None if args.no_cache else BUILD_CACHE_DIR)
+
+    with open(os.path.join(output_dir, REPORT_NAME), 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+
+    print_report(report)
+    print(f"📁 素材位置: {output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""牌面按绘制指令去重：指令相同的主题共用牌面，指令不同（用到了被覆盖的配色）的不共用"""
+
+import numpy as np
+
+from asset_pipeline.deck import JOKER_BIG, record_face, render_face, render_shared_face
+from asset_pipeline.themes import make_generator
+
+
+def digest(theme, name, tier='1x'):
+    return record_face(make_generator(theme, tier), name).ops_digest()
+
+
+def test_back_only_theme_shares_number_faces():
+    # 春节只改卡背和王牌金色：普通牌与专业版相同，大王不同
+    assert digest('spring_festival', 'hearts_K') == digest('premium', 'hearts_K')
+    assert digest('spring_festival', JOKER_BIG) != digest('premium', JOKER_BIG)
+
+
+def test_face_colour_override_is_not_shared():
+    # 冬季改了牌面底色和边框，普通牌不能共用；王牌底板不受影响
+    assert digest('winter', 'spades_2') != digest('premium', 'spades_2')
+    assert digest('winter', JOKER_BIG) == digest('premium', JOKER_BIG)
+
+
+def test_digest_is_independent_of_tier():
+    assert digest('classic', 'diamonds_10', '1x') == digest('classic', 'diamonds_10', '3x')
+
+
+def test_shared_face_matches_direct_render():
+    for tier in ('1x', '2x'):
+        generator = make_generator('premium', tier)
+        shared = render_shared_face(generator, 'clubs_Q')
+        assert shared.size == render_face(generator, 'clubs_Q').size
+        np.testing.assert_array_equal(np.asarray(shared), np.asarray(render_face(generator, 'clubs_Q')))
+        # 牌面指令相同的另一个主题直接拿到同一张图
+        assert render_shared_face(make_generator('spring_festival', tier), 'clubs_Q') is shared
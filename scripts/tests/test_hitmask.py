@@ -0,0 +1,118 @@
+"""点击遮罩：编码 / 解码往返、逐格点击结果和裁剪框边界情况"""
+
+import numpy as np
+import pytest
+
+from asset_pipeline.hitmask import (HIT_THRESHOLD, HITMASK_CELL, decode_hitmask, encode_hitmask, hit_masks,
+                                    hit_test, trim_bounds)
+
+
+def expected_hits(frame, cell):
+    """按定义独立计算每个像素的点击结果：所在格的平均 alpha（只算帧内像素）过半，且在 alpha > 0 的包围框内"""
+    alpha = frame[..., 3].astype(np.float64)
+    height, width = alpha.shape
+    hits = np.zeros((height, width), dtype=bool)
+    ys, xs = np.nonzero(alpha)
+    if not len(xs):
+        return hits
+    for y in range(0, height, cell):
+        for x in range(0, width, cell):
+            hits[y:y + cell, x:x + cell] = alpha[y:y + cell, x:x + cell].mean() >= HIT_THRESHOLD
+    inside = np.zeros_like(hits)
+    inside[ys.min():ys.max() + 1, xs.min():xs.max() + 1] = True
+    return hits & inside
+
+
+def blank_frames(count, width, height):
+    return np.zeros((count, height, width, 4), dtype=np.uint8)
+
+
+def test_round_trip_keeps_header_indices_and_masks(classic_frames):
+    frames, indices = classic_frames
+    hitmask = decode_hitmask(encode_hitmask(frames, indices))
+
+    count, height, width, _ = frames.shape
+    assert hitmask['cell'] == HITMASK_CELL
+    assert hitmask['frame_size'] == (width, height)
+    assert hitmask['mask_size'] == (-(-width // HITMASK_CELL), -(-height // HITMASK_CELL))
+    np.testing.assert_array_equal(hitmask['indices'], indices)
+    np.testing.assert_array_equal(hitmask['trims'], trim_bounds(frames))
+    np.testing.assert_array_equal(hitmask['masks'], hit_masks(frames))
+    assert hitmask['masks'].shape[0] == count
+
+
+def test_hit_test_matches_source_alpha_for_every_cell(classic_frames):
+    frames, indices = classic_frames
+    hitmask = decode_hitmask(encode_hitmask(frames, indices))
+    height, width = frames.shape[1:3]
+
+    # 每个不重复的遮罩取其首次出现的帧，逐格查一个像素
+    first_frames = {}
+    for frame, mask in enumerate(indices.tolist()):
+        first_frames.setdefault(mask, frame)
+    for mask, frame in first_frames.items():
+        expected = expected_hits(frames[mask], HITMASK_CELL)
+        for y in range(0, height, HITMASK_CELL):
+            for x in range(0, width, HITMASK_CELL):
+                assert hit_test(hitmask, frame, x, y) == expected[y, x], (frame, x, y)
+
+
+def test_classic_frame_misses_transparent_corner_and_hits_centre(classic_frames):
+    frames, indices = classic_frames
+    hitmask = decode_hitmask(encode_hitmask(frames, indices))
+    height, width = frames.shape[1:3]
+
+    # 圆角外的像素全透明，点击应落到下面的牌上
+    assert frames[indices[0], 0, 0, 3] == 0
+    assert not hit_test(hitmask, 0, 0, 0)
+    assert not hit_test(hitmask, 0, width - 1, height - 1)
+    assert hit_test(hitmask, 0, width // 2, height // 2)
+
+
+def test_duplicate_frames_share_one_mask(classic_frames):
+    frames, indices = classic_frames
+    hitmask = decode_hitmask(encode_hitmask(frames, indices))
+    # 两副牌：第 i 帧和第 i + 52 帧是同一张牌
+    assert hitmask['indices'][0] == hitmask['indices'][52]
+    assert len(hitmask['masks']) == len(set(indices.tolist()))
+
+
+def test_trim_bounds_of_fully_transparent_frame_is_empty():
+    frames = blank_frames(2, 8, 6)
+    frames[1, 2:4, 3:5, 3] = 255
+
+    np.testing.assert_array_equal(trim_bounds(frames), [[0, 0, 0, 0], [3, 2, 5, 4]])
+    hitmask = decode_hitmask(encode_hitmask(frames, [0, 1]))
+    assert not any(hit_test(hitmask, 0, x, y) for y in range(6) for x in range(8))
+
+
+@pytest.mark.parametrize('cell', [2, 3])
+def test_frame_size_not_multiple_of_cell(cell):
+    # 7×5 的帧，只有最右一列和最下一行不透明：边缘不完整的格只按帧内像素平均
+    width, height = 7, 5
+    frames = blank_frames(1, width, height)
+    frames[0, :, width - 1, 3] = 255
+    frames[0, height - 1, :, 3] = 255
+
+    np.testing.assert_array_equal(trim_bounds(frames), [[0, 0, width, height]])
+    hitmask = decode_hitmask(encode_hitmask(frames, [0], cell))
+    assert hitmask['mask_size'] == (-(-width // cell), -(-height // cell))
+    expected = expected_hits(frames[0], cell)
+    for y in range(height):
+        for x in range(width):
+            assert hit_test(hitmask, 0, x, y) == expected[y, x], (x, y)
+    # 右下角不完整的格只含帧内的不透明像素（按帧内像素平均为 255），应可点击
+    assert hit_test(hitmask, 0, width - 1, height - 1)
+
+
+def test_trim_bounds_threshold_ignores_faint_pixels():
+    frames = blank_frames(1, 4, 4)
+    frames[0, 0, 0, 3] = 1
+    frames[0, 2, 1, 3] = 200
+    np.testing.assert_array_equal(trim_bounds(frames), [[0, 0, 2, 3]])
+    np.testing.assert_array_equal(trim_bounds(frames, threshold=1), [[1, 2, 2, 3]])
+
+
+def test_decode_rejects_other_files():
+    with pytest.raises(ValueError):
+        decode_hitmask(b'RTEX' + bytes(40))
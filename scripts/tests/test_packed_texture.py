@@ -0,0 +1,114 @@
+"""16 位纹理：文件头、RGBA4444 / RGBA5551 位布局、5551 的 alpha 阈值和编码 / 解码往返"""
+
+import struct
+
+import numpy as np
+import pytest
+
+from asset_pipeline.packed_texture import (FLAG_PREMULTIPLIED, PACKED_FORMATS, PACKED_MAGIC, PACKED_VERSION,
+                                           decode_packed_texture, encode_packed_texture)
+
+HEADER = struct.Struct('<4sBBBBHHI')
+
+
+def solid(color, width=4, height=4):
+    """纯色图像：纯色区域不抖动，直接取最近色阶"""
+    return np.tile(np.array(color, dtype=np.uint8), (height, width, 1))
+
+
+def words(data):
+    return np.frombuffer(data, '<u2', offset=HEADER.size)
+
+
+def gradient(width=48, height=40):
+    """带半透明边缘的渐变图，覆盖抖动路径"""
+    y, x = np.mgrid[0:height, 0:width]
+    pixels = np.zeros((height, width, 4), dtype=np.uint8)
+    pixels[..., 0] = x * 255 // (width - 1)
+    pixels[..., 1] = y * 255 // (height - 1)
+    pixels[..., 2] = (x + y) * 255 // (width + height - 2)
+    pixels[..., 3] = np.clip((x - 4) * 32, 0, 255)
+    return pixels
+
+
+@pytest.mark.parametrize('fmt', sorted(PACKED_FORMATS))
+@pytest.mark.parametrize('premultiplied', [True, False])
+def test_header(fmt, premultiplied):
+    data = encode_packed_texture(solid((10, 20, 30, 255), 5, 3), fmt, premultiplied)
+    magic, version, code, flags, reserved, width, height, length = HEADER.unpack_from(data)
+
+    assert (magic, version, code, reserved) == (PACKED_MAGIC, PACKED_VERSION, PACKED_FORMATS[fmt][0], 0)
+    assert (width, height) == (5, 3)
+    assert length == 5 * 3 * 2 == len(data) - HEADER.size
+    # rgba5551 的透明像素颜色总是 0，结果本身就是预乘的
+    assert bool(flags & FLAG_PREMULTIPLIED) == (premultiplied or fmt == 'rgba5551')
+
+    decoded_fmt, decoded_premultiplied, rgba = decode_packed_texture(data)
+    assert decoded_fmt == fmt
+    assert decoded_premultiplied == bool(flags & FLAG_PREMULTIPLIED)
+    assert rgba.shape == (3, 5, 4)
+
+
+def test_rgba4444_bit_layout():
+    # 每个通道取不同的色阶（x * 17 正好落在 4 位色阶上），位布局 RRRRGGGGBBBBAAAA
+    color = (1 * 17, 2 * 17, 3 * 17, 15 * 17)
+    data = encode_packed_texture(solid(color), 'rgba4444', premultiplied=False)
+
+    assert (words(data) == 0x123F).all()
+    assert data[HEADER.size:HEADER.size + 2] == b'\x3f\x12'
+    _, _, rgba = decode_packed_texture(data)
+    assert (rgba == color).all()
+
+
+def test_rgba4444_premultiplies_and_clamps_color_to_alpha():
+    data = encode_packed_texture(solid((255, 255, 255, 136)), 'rgba4444', premultiplied=True)
+    # alpha 136 = 8 × 17，预乘后的颜色同为 8
+    assert (words(data) == 0x8888).all()
+
+    _, _, rgba = decode_packed_texture(encode_packed_texture(gradient(), 'rgba4444', premultiplied=True))
+    assert (rgba[..., :3] <= rgba[..., 3:4]).all()
+
+
+def test_rgba5551_bit_layout():
+    # 5 位色阶 r=31、g=0、b=16 解码后的 8 位值，位布局 RRRRRGGGGGBBBBBA
+    levels = (31, 0, 16)
+    color = tuple((level * 255 + 15) // 31 for level in levels) + (255,)
+    data = encode_packed_texture(solid(color), 'rgba5551')
+
+    assert (words(data) == (31 << 11) | (0 << 6) | (16 << 1) | 1).all()
+    _, _, rgba = decode_packed_texture(data)
+    assert (rgba == color).all()
+
+
+@pytest.mark.parametrize('alpha, opaque', [(0, False), (127, False), (128, True), (255, True)])
+def test_rgba5551_alpha_threshold(alpha, opaque):
+    data = encode_packed_texture(solid((200, 100, 50, alpha)), 'rgba5551')
+    bits = words(data)
+
+    assert ((bits & 1) == opaque).all()
+    _, _, rgba = decode_packed_texture(data)
+    assert (rgba[..., 3] == (255 if opaque else 0)).all()
+    if not opaque:
+        # 透明像素颜色置 0
+        assert not bits.any()
+
+
+@pytest.mark.parametrize('fmt, bits', [('rgba4444', 4), ('rgba5551', 5)])
+def test_dithered_round_trip_stays_within_one_level(fmt, bits):
+    pixels = gradient()
+    _, _, rgba = decode_packed_texture(encode_packed_texture(pixels, fmt, premultiplied=False))
+
+    step = 255 / ((1 << bits) - 1)
+    if fmt == 'rgba5551':
+        opaque = pixels[..., 3] >= 128
+        assert (rgba[..., 3] == np.where(opaque, 255, 0)).all()
+        source, decoded = pixels[opaque][:, :3], rgba[opaque][:, :3]
+    else:
+        source, decoded = pixels, rgba
+    # 抖动最多偏一个色阶，再加解码取整
+    assert np.abs(decoded.astype(int) - source.astype(int)).max() <= step + 1
+
+
+def test_decode_rejects_other_files():
+    with pytest.raises(ValueError):
+        decode_packed_texture(b'HMSK' + bytes(20))